@@ -1,11 +1,17 @@
 #!/usr/bin/python3
 """Init file of the brfast.config."""
 
+import collections
 import configparser
+import functools
+import hashlib
+import importlib.util
 import os
-import sys
-from pathlib import Path, PurePath
-from typing import Optional
+import pickle
+import stat
+import tempfile
+import types
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from loguru import logger
 
@@ -13,82 +19,259 @@ from loguru import logger
 OPTION_FILE_NAME = 'config.ini'
 ANALYSIS_ENGINES = ['pandas', 'modin.pandas']
 MODIN_ENGINES = ['ray', 'dask']
+CSV_ENGINES = ['c', 'pyarrow']
+CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'brfast')
+BINARY_CHECK_SIZE = 4096
 
 
-def check_parameter(verification: bool, error_message: Optional[str] = '',
-                    success_message: Optional[str] = ''):
-    """Check a parameter and exist if the parameter is incorrect.
+# The logger that only generates its messages when they are displayed. It is
+# created once instead of on every check of a parameter.
+_LAZY_LOGGER = logger.opt(lazy=True)
 
-    If the parameter is incorrect, we end the execution.
+
+class ConfigError(RuntimeError):
+    """A parameter of the config file is incorrect."""
+
+
+def check_parameter(
+        verification: bool, error_message: Optional[str] = '',
+        success_message_factory: Optional[Callable[[], str]] = None):
+    """Check a parameter and raise an exception if it is incorrect.
 
     Args:
     verification: The verification of the parameter.
     error_message: The error message to display if the parameter is
                    incorrect.
-    success_message: The message to display if everything is fine.
+    success_message_factory: The function generating the message to display
+                             if everything is fine. It is only called when
+                             the debug messages are displayed.
+
+    Raises:
+        ConfigError: The parameter is incorrect.
     """
-    if verification:
-        logger.debug(success_message)
-    else:
-        logger.error(error_message)
-        sys.exit()
+    if not verification:
+        raise ConfigError(error_message)
+    if success_message_factory:
+        _LAZY_LOGGER.debug('{message}', message=success_message_factory)
+
+
+def _to_boolean(value: str) -> bool:
+    """Convert a raw configuration value to a boolean like ConfigParser does.
+
+    Args:
+        value: The raw value of the parameter.
 
+    Raises:
+        ValueError: The value cannot be converted to a boolean.
 
-# The configuration of BrFAST is stored in the params object
-if 'params' not in locals():
-    # Read the configuration file to retrieve the configurations
-    params = configparser.ConfigParser()
-    current_file_absolute_path = PurePath(os.path.abspath(__file__))
-    brfast_root = current_file_absolute_path.parents[2]
-    params.read(os.path.join(brfast_root, OPTION_FILE_NAME))
+    Returns:
+        The value converted to a boolean.
+    """
+    boolean_states = configparser.ConfigParser.BOOLEAN_STATES
+    if value.lower() not in boolean_states:
+        raise ValueError(f'Not a boolean: {value}')
+    return boolean_states[value.lower()]
+
+
+def _is_strictly_positive(value: float) -> bool:
+    """Check that a numeric parameter is strictly positive.
+
+    Args:
+        value: The converted value of the parameter.
+
+    Returns:
+        Whether the value is strictly positive.
+    """
+    return value > 0
+
+
+# The schema of the parameters that are checked independently of each other.
+# Each section is mapped to its parameters as (option, conversion, predicate,
+# error message). The conversion raises a ValueError if the raw value cannot
+# be converted, and the predicate is verified on the converted value.
+PARAMETERS_SCHEMA = {
+    'Multiprocessing': (
+        ('free_cores', int, lambda value: value >= 0,
+         'The number of free cores should be a positive integer'),
+        ('measures', _to_boolean, lambda value: True, ''),
+        ('explorations', _to_boolean, lambda value: True, '')
+    ),
+    'WebServer': (
+        ('secret_key_size', int, _is_strictly_positive,
+         'The secret key size should be a strictly positive integer'),
+        ('fingerprint_sample_size', int, _is_strictly_positive,
+         'The fingerprint sample size should be a strictly positive integer'),
+        ('bootstrap_progess_bars', str, lambda value: bool(value.strip()),
+         'The bootstrap progress bars should contain at least one class'),
+        ('fpselect_default_explored_paths', int, _is_strictly_positive,
+         'The default number of explored paths by FPSelect should be a '
+         'strictly positive integer'),
+        ('fpselect_minimum_explored_paths', int, _is_strictly_positive,
+         'The minimum number of explored paths by FPSelect should be a '
+         'strictly positive integer'),
+        ('fpselect_maximum_explored_paths', int, _is_strictly_positive,
+         'The maximum number of explored paths by FPSelect should be a '
+         'strictly positive integer'),
+        ('fpselect_step_explored_paths', int, _is_strictly_positive,
+         'The step for the explored paths by FPSelect should be a strictly '
+         'positive integer'),
+        ('top_k_fingerprints_sensitivity_measure_default_k', int,
+         _is_strictly_positive,
+         'The default k for the TopKFingerprints sensitivity measure should '
+         'be a strictly positive integer'),
+        ('top_k_fingerprints_sensitivity_measure_min_k', int,
+         _is_strictly_positive,
+         'The minimum k for the TopKFingerprints sensitivity measure should '
+         'be a strictly positive integer'),
+        ('top_k_fingerprints_sensitivity_measure_max_k', int,
+         _is_strictly_positive,
+         'The maximum k for the TopKFingerprints sensitivity measure should '
+         'be a strictly positive integer'),
+        ('top_k_fingerprints_sensitivity_measure_step_k', int,
+         _is_strictly_positive,
+         'The step for the k parameter of the TopKFingerprints sensitivity '
+         'measure should be a strictly positive integer')
+    ),
+    'VisualizationParameters': (
+        ('float_precision', int, _is_strictly_positive,
+         'The float precision should be a strictly positive integer'),
+        ('collected_nodes_step', int, _is_strictly_positive,
+         'The collected nodes step should be a strictly positive integer'),
+        ('collect_frequency', int, _is_strictly_positive,
+         'The collect frequency should be a strictly positive integer'),
+        ('nodes_limit', int, _is_strictly_positive,
+         'The node limits should be a strictly positive integer'),
+        ('link_width', int, _is_strictly_positive,
+         'The link width should be a strictly positive integer'),
+        ('link_opacity', float, _is_strictly_positive,
+         'The link opacity should be a strictly positive float'),
+        ('link_colour', str, bool, 'The link colour should not be empty'),
+        ('node_radius', int, _is_strictly_positive,
+         'The node radius should be a strictly positive integer'),
+        ('node_collision_radius_multiplicator', float, _is_strictly_positive,
+         'The node collision radius multiplicator should be a strictly '
+         'positive float')
+    )
+}
+
+# The cross-parameter constraints of the WebServer section as (default,
+# minimum, maximum, step, range) where the range is the name under which the
+# difference between the maximum and the minimum is stored
+WEBSERVER_RANGES = (
+    ('fpselect_default_explored_paths', 'fpselect_minimum_explored_paths',
+     'fpselect_maximum_explored_paths', 'fpselect_step_explored_paths',
+     'fpselect_explored_paths_range'),
+    ('top_k_fingerprints_sensitivity_measure_default_k',
+     'top_k_fingerprints_sensitivity_measure_min_k',
+     'top_k_fingerprints_sensitivity_measure_max_k',
+     'top_k_fingerprints_sensitivity_measure_step_k',
+     'top_k_fingerprints_range')
+)
+
+
+def _check_section(params: configparser.ConfigParser,
+                   section: str) -> Dict[str, Any]:
+    """Convert and check the parameters of a section following its schema.
+
+    The raw values of the section are read once, then each parameter is
+    converted and verified by the predicate of PARAMETERS_SCHEMA.
+
+    Args:
+        params: The parsed config file.
+        section: The name of the section to check.
+
+    Raises:
+        ValueError: A raw value cannot be converted.
+
+    Returns:
+        A dictionary mapping the name of the parameters to their value.
+    """
+    raw_values = dict(params[section])
+    values = {}
+    for option, conversion, predicate, error_message in (
+            PARAMETERS_SCHEMA[section]):
+        value = conversion(raw_values[option])
+        check_parameter(
+            predicate(value), error_message,
+            lambda option=option, value=value: (
+                f'Setting {section}.{option} = {value}'))
+        values[option] = value
+    return values
+
+
+def _parse_params(option_file_path: str) -> Dict[str, Any]:
+    """Parse the config file and check the DataAnalysis and Multiprocessing.
+
+    The other sections are checked on the first access to their parameters.
+
+    Args:
+        option_file_path: The path to the config file.
+
+    Returns:
+        A dictionary mapping the name of the parameters to their value.
+    """
+    # Fail fast if the config file is a binary file
+    with open(option_file_path, 'rb') as option_file:
+        check_parameter(
+            b'\x00' not in option_file.read(BINARY_CHECK_SIZE),
+            f'The config file {option_file_path} is a binary file')
+
+    # Read the configuration file to retrieve the configurations. It uses no
+    # interpolation, only the '=' delimiter, and no empty lines inside the
+    # values.
+    params = configparser.ConfigParser(
+        interpolation=None, empty_lines_in_values=False, delimiters=('=',),
+        comment_prefixes=(';', '#'))
+    params.read(option_file_path)
 
     # ========================= Check the parameters ==========================
 
     # ===== DataAnalysis section
+    data_analysis = dict(params['DataAnalysis'])
+
     # The data analysis engine
-    analysis_engine = params.get('DataAnalysis', 'engine')
+    analysis_engine = data_analysis['engine']
     check_parameter(
         analysis_engine in ANALYSIS_ENGINES,
         f'Unknown data analysis engine: received {analysis_engine} which is '
         f'not among the accepted values {ANALYSIS_ENGINES}',
-        f'Setting DataAnalysis.engine = {analysis_engine}')
+        lambda: f'Setting DataAnalysis.engine = {analysis_engine}')
 
     # If using the modin engine, check and set the modin engine
     if analysis_engine == 'modin.pandas':
-        modin_engine = params.get('DataAnalysis', 'modin_engine')
+        modin_engine = data_analysis['modin_engine']
         check_parameter(
             modin_engine in MODIN_ENGINES,
             f'Unknown modin engine: received "{modin_engine}" which is not '
             f'among the accepted values {MODIN_ENGINES}',
-            f'Setting DataAnalysis.modin_engine = {modin_engine}')
-
-        # Set the modin engine
-        os.environ['MODIN_ENGINE'] = modin_engine
+            lambda: f'Setting DataAnalysis.modin_engine = {modin_engine}')
+    else:
+        modin_engine = None
 
-    # ===== Multiprocessing section
-    # The number of cores to let for the other processes on the system
-    free_cores = params.getint('Multiprocessing', 'free_cores')
+    # The parser of the csv files, which defaults to the C parser of pandas
+    csv_engine = data_analysis.get('csv_engine', 'c')
     check_parameter(
-        free_cores >= 0,
-        'The number of free cores should be a strictly positive integer',
-        f'Setting Multiprocessing.free_cores = {free_cores}')
+        csv_engine in CSV_ENGINES,
+        f'Unknown csv engine: received "{csv_engine}" which is not among the '
+        f'accepted values {CSV_ENGINES}',
+        lambda: f'Setting DataAnalysis.csv_engine = {csv_engine}')
 
-    # Whether we should use multiprocessing for the measures
-    multiprocessing_measures = params.getboolean('Multiprocessing', 'measures')
-    # Will raise a ValueError is it cannot be converted to a boolean value
+    # Whether the string attributes are stored as categorical columns
+    categorize_strings = data_analysis.get('categorize_strings', 'false')
     check_parameter(
-        isinstance(multiprocessing_measures, bool),
-        success_message='Setting Multiprocessing.measures = '
-                        f'{multiprocessing_measures}')
-
-    # Whether we should use multiprocessing for the exploration methods
-    multiprocessing_explorations = params.getboolean('Multiprocessing',
-                                                     'explorations')
-    # Will raise a ValueError is it cannot be converted to a boolean value
-    check_parameter(
-        isinstance(multiprocessing_explorations, bool),
-        success_message='Setting Multiprocessing.explorations = '
-                        f'{multiprocessing_explorations}')
+        categorize_strings.lower() in configparser.ConfigParser.BOOLEAN_STATES,
+        'The parameter DataAnalysis.categorize_strings should be a boolean: '
+        f'received "{categorize_strings}"',
+        lambda: ('Setting DataAnalysis.categorize_strings = '
+                 f'{categorize_strings}'))
+    categorize_strings = _to_boolean(categorize_strings)
+
+    # ===== Multiprocessing section
+    # The number of free cores and whether we should use multiprocessing for
+    # the measures and for the exploration methods
+    multiprocessing = _check_section(params, 'Multiprocessing')
+    multiprocessing_measures = multiprocessing['measures']
+    multiprocessing_explorations = multiprocessing['explorations']
 
     # DO NOT use multiprocessing if modin is used. It generates errors and
     # provide no gain as modin already executes the processes in parallel
@@ -99,221 +282,363 @@ if 'params' not in locals():
         logger.warning('Updating Multiprocessing.explorations to False')
         multiprocessing_measures = multiprocessing_explorations = False
 
-    # ===== WebServer section
-    # The upload folder where to save the temporary files
-    upload_foler = params.get('WebServer', 'upload_folder')
-    check_parameter(
-        Path(upload_foler).is_dir(),
-        f'The upload folder {upload_foler} of the web server does not exist',
-        f'Using the upload folder {upload_foler}')
+    return {
+        'params': params,
+        'analysis_engine': analysis_engine,
+        'modin_engine': modin_engine,
+        'csv_engine': csv_engine,
+        'categorize_strings': categorize_strings,
+        'free_cores': multiprocessing['free_cores'],
+        'multiprocessing_measures': multiprocessing_measures,
+        'multiprocessing_explorations': multiprocessing_explorations
+    }
 
-    # The size of the secret key for some functionalities of the WebServer
-    secret_key_size = params.getint('WebServer', 'secret_key_size')
-    check_parameter(
-        secret_key_size > 0,
-        'The secret key size should be a strictly positive integer',
-        'Setting WebServer.secret_key_size = '
-        f'{secret_key_size}')
-
-    # The size of the fingerprint sample on the attribute information page
-    fingerprint_sample_size = params.getint(
-        'WebServer', 'fingerprint_sample_size')
-    check_parameter(
-        fingerprint_sample_size > 0,
-        'The fingerprint sample size should be a strictly positive integer',
-        'Setting WebServer.fingerprint_sample_size = '
-        f'{fingerprint_sample_size}')
-
-    # The name of the classes of the bootstrap progress bars
-    bootstrap_progess_bars = params.get('WebServer', 'bootstrap_progess_bars')
-    bootstrap_progess_bars_as_list = bootstrap_progess_bars.splitlines()
-    check_parameter(
-        len(bootstrap_progess_bars_as_list) > 0,
-        'The bootstrap progress bars should contain at least one class',
-        'Setting WebServer.bootstrap_progess_bars = '
-        f'{", ".join(bootstrap_progess_bars_as_list)}')
+
+def _load_webserver(params: configparser.ConfigParser) -> Dict[str, Any]:
+    """Check the parameters of the WebServer section.
+
+    Args:
+        params: The parsed config file.
+
+    Returns:
+        A dictionary mapping the name of the parameters to their value.
+    """
+    web = _check_section(params, 'WebServer')
+
+    # ===== WebServer section
+    # The upload folder where to save the temporary files. Its existence is
+    # checked when the web server starts.
+    web['upload_foler'] = params['WebServer']['upload_folder']
 
     # The mapping between the flash classes of Flask and the alert classes of
     # bootstrap
-    for flash_class in ['error', 'warning', 'info', 'success']:
-        flash_class_name = f'flash_{flash_class}_class'
-        class_value = params.get('WebServer', flash_class_name)
-        check_parameter(
-            class_value,
-            success_message=f'Setting WebServer.{flash_class_name} = '
-                            f'{class_value}')
-
-    # --- The range of the number of explored paths of FPSelect
-    # Default number of explored paths
-    fpselect_default_explored_paths = params.getint(
-        'WebServer', 'fpselect_default_explored_paths')
-    check_parameter(
-        fpselect_default_explored_paths > 0,
-        'The default number of explored paths by FPSelect should be a strictly'
-        ' positive integer',
-        'Setting WebServer.fpselect_default_explored_paths = '
-        f'{fpselect_default_explored_paths}')
-
-    # Minimum number of explored paths
-    fpselect_minimum_explored_paths = params.getint(
-        'WebServer', 'fpselect_minimum_explored_paths')
+    flash_classes = {
+        flash_class: params['WebServer'][f'flash_{flash_class}_class']
+        for flash_class in ('error', 'warning', 'info', 'success')}
     check_parameter(
-        0 < fpselect_minimum_explored_paths <= fpselect_default_explored_paths,
-        'The minimum number of explored paths by FPSelect should be a strictly'
-        ' positive integer and lower or equal to the default value',
-        'Setting WebServer.fpselect_minimum_explored_paths = '
-        f'{fpselect_minimum_explored_paths}')
-
-    # Maximum number of explored paths
-    fpselect_maximum_explored_paths = params.getint(
-        'WebServer', 'fpselect_maximum_explored_paths')
-    check_parameter(
-        0 < fpselect_default_explored_paths <= fpselect_maximum_explored_paths,
-        'The maximum number of explored paths by FPSelect should be a strictly'
-        ' positive integer and higher or equal to both the default and the '
-        'minimum value',
-        'Setting WebServer.fpselect_maximum_explored_paths = '
-        f'{fpselect_maximum_explored_paths}')
-
-    # Step for the number of explored paths
-    fpselect_step_explored_paths = params.getint(
-        'WebServer', 'fpselect_step_explored_paths')
-    fpselect_explored_paths_range = (fpselect_maximum_explored_paths
-                                     - fpselect_minimum_explored_paths)
-    check_parameter(
-        0 < fpselect_step_explored_paths <= fpselect_explored_paths_range,
-        'The step for the explored paths by FPSelect should be a strictly'
-        ' positive integer and higher or equal to the range size',
-        'Setting WebServer.fpselect_step_explored_paths = '
-        f'{fpselect_step_explored_paths}')
+        all(flash_classes.values()),
+        'The alert classes of the flash classes should not be empty',
+        lambda: f'Setting the WebServer.flash_*_class = {flash_classes}')
+    web['flash_classes'] = flash_classes
 
-    # --- The number of common fingerprints for the top-k fingerprints
+    # --- The cross-parameter constraints of the ranges of the number of
+    #     explored paths of FPSelect and of the k of the top-k fingerprints
     #     sensitivity measure
-    # Default number of common fingerprints
-    top_k_fingerprints_sensitivity_measure_default_k = params.getint(
-        'WebServer', 'top_k_fingerprints_sensitivity_measure_default_k')
-    check_parameter(
-        top_k_fingerprints_sensitivity_measure_default_k > 0,
-        'The default k for the TopKFingerprints sensitivity measure should be '
-        'a strictly positive integer',
-        'Setting WebServer.top_k_fingerprints_sensitivity_measure_default_k = '
-        f'{top_k_fingerprints_sensitivity_measure_default_k}')
-
-    # Minimum number of common fingerprints
-    top_k_fingerprints_sensitivity_measure_min_k = params.getint(
-        'WebServer', 'top_k_fingerprints_sensitivity_measure_min_k')
-    check_parameter(
-        0 < top_k_fingerprints_sensitivity_measure_min_k
-        <= top_k_fingerprints_sensitivity_measure_default_k,
-        'The minimum k for the TopKFingerprints sensitivity measure should be '
-        'a strictly positive integer and lower or equal to the default value',
-        'Setting WebServer.top_k_fingerprints_sensitivity_measure_min_k = '
-        f'{top_k_fingerprints_sensitivity_measure_min_k}')
-
-    # Maximum number of common fingerprints
-    top_k_fingerprints_sensitivity_measure_max_k = params.getint(
-        'WebServer', 'top_k_fingerprints_sensitivity_measure_max_k')
-    check_parameter(
-        0 < top_k_fingerprints_sensitivity_measure_default_k
-        <= top_k_fingerprints_sensitivity_measure_max_k,
-        'The maximum k for the TopKFingerprints sensitivity measure should be '
-        'a strictly positive integer and higher or equal to the default value',
-        'Setting WebServer.top_k_fingerprints_sensitivity_measure_max_k = '
-        f'{top_k_fingerprints_sensitivity_measure_max_k}')
-
-    # Step for the number of common fingerprints
-    top_k_fingerprints_sensitivity_measure_step_k = params.getint(
-        'WebServer', 'top_k_fingerprints_sensitivity_measure_step_k')
-    top_k_fingerprints_range = (top_k_fingerprints_sensitivity_measure_max_k
-                                - top_k_fingerprints_sensitivity_measure_min_k)
-    check_parameter(
-        0 < top_k_fingerprints_sensitivity_measure_step_k
-        <= top_k_fingerprints_range,
-        'The step for the k parameter of the TopKFingerprints sensitivity '
-        'measure should be a strictly positive integer and higher or equal to '
-        'the range for this parameter',
-        'Setting WebServer.top_k_fingerprints_sensitivity_measure_step_k = '
-        f'{top_k_fingerprints_sensitivity_measure_step_k}')
-
-    # ===== VisualizationParameters section
-    # The precision of the float values displayed on the web pages
-    float_precision = params.getint(
-        'VisualizationParameters', 'float_precision')
-    check_parameter(
-        float_precision > 0,
-        'The float precision should be a strictly positive integer',
-        f'Setting VisualizationParameters.float_precision = {float_precision}')
-
-    # The collected nodes step (i.e., how many attribute sets are collected on
-    # every tick)
-    collected_nodes_step = params.getint('VisualizationParameters',
-                                         'collected_nodes_step')
-    check_parameter(
-        collected_nodes_step > 0,
-        'The collected nodes step should be a strictly positive integer',
-        'Setting VisualizationParameters.collected_nodes_step = '
-        f'{collected_nodes_step}')
-
-    # The frequency on which to collect the new attribute sets
-    collect_frequency = params.getint(
-        'VisualizationParameters', 'collect_frequency')
-    check_parameter(
-        collect_frequency > 0,
-        'The collect frequency should be a strictly positive integer',
-        'Setting VisualizationParameters.collect_frequency = '
-        f'{collect_frequency}')
-
-    # The limit on the number of nodes that are displayed (not used for now)
-    nodes_limit = params.getint('VisualizationParameters', 'nodes_limit')
-    check_parameter(nodes_limit > 0,
-                    'The node limits should be a strictly positive integer',
-                    'Setting VisualizationParameters.nodes_limit = '
-                    f'{nodes_limit}')
-
-    # The width of the links of the visualization graph
-    link_width = params.getint('VisualizationParameters', 'link_width')
-    check_parameter(link_width > 0,
-                    'The link width should be a strictly positive integer',
-                    'Setting VisualizationParameters.link_width = '
-                    f'{link_width}')
-
-    # The opacity of the links of the visualization graph
-    link_opacity = params.getfloat('VisualizationParameters', 'link_opacity')
-    check_parameter(link_opacity > 0,
-                    'The link opacity should be a strictly positive float',
-                    'Setting VisualizationParameters.link_opacity = '
-                    f'{link_opacity}')
-
-    # The colour of the links of the visualization graph
-    link_colour = params.get('VisualizationParameters', 'link_colour')
-    check_parameter(
-        link_colour,
-        success_message='Setting VisualizationParameters.link_colour = '
-                        f'{link_colour}')
+    for default, minimum, maximum, step, value_range in WEBSERVER_RANGES:
+        check_parameter(
+            web[minimum] <= web[default] <= web[maximum],
+            f'The parameters should verify WebServer.{minimum} <= '
+            f'WebServer.{default} <= WebServer.{maximum}')
+        web[value_range] = web[maximum] - web[minimum]
+        check_parameter(
+            web[step] <= web[value_range],
+            f'The parameter WebServer.{step} should be lower or equal to the '
+            f'range between WebServer.{minimum} and WebServer.{maximum}')
 
-    # The radius of the nodes of the visualization graph
-    node_radius = params.getint('VisualizationParameters', 'node_radius')
-    check_parameter(
-        node_radius > 0,
-        'The node radius should be a strictly positive integer',
-        f'Setting VisualizationParameters.node_radius = {node_radius}')
-
-    # The multiplicator for the radius of the nodes of the visualization graph
-    # used to generate the collision radius
-    node_collision_radius_multiplicator = params.getfloat(
-        'VisualizationParameters', 'node_collision_radius_multiplicator')
-    check_parameter(
-        node_collision_radius_multiplicator > 0,
-        'The node collision radius multiplicator should be a strictly '
-        'positive float',
-        'Setting VisualizationParameters.node_collision_radius_multiplicator ='
-        f' {node_collision_radius_multiplicator}')
+    return web
+
+
+def _load_visualization(params: configparser.ConfigParser) -> Dict[str, Any]:
+    """Check the parameters of the VisualizationParameters section.
+
+    Args:
+        params: The parsed config file.
+
+    Returns:
+        A dictionary mapping the name of the parameters to their value.
+    """
+    return _check_section(params, 'VisualizationParameters')
+
+
+def _load_nodecolour(params: configparser.ConfigParser) -> Dict[str, Any]:
+    """Check the parameters of the NodeColour section.
+
+    Args:
+        params: The parsed config file.
+
+    Returns:
+        A dictionary mapping the name of the parameters to their value.
+    """
+    node_colour = dict(params['NodeColour'])
 
     # ===== NodeColour section
     # The mapping between each attribute set state and its colour
-    for state in ['explored', 'pruned', 'best_solution',
-                  'satisfying_sensitivity', 'empty_node', 'default']:
-        state_colour = params.get('NodeColour', state)
-        check_parameter(
-            state_colour,
-            success_message=f'Setting NodeColour.{state} = {state_colour}')
+    node_colours = {
+        state: node_colour[state]
+        for state in ('explored', 'pruned', 'best_solution',
+                      'satisfying_sensitivity', 'empty_node', 'default')}
+    check_parameter(
+        all(node_colours.values()),
+        'The colours of the node states should not be empty',
+        lambda: f'Setting NodeColour = {node_colours}')
+
+    return {
+        'node_colours': node_colours
+    }
+
+
+def _check_installed_engines(values: Dict[str, Any]):
+    """Check that the selected engines are installed.
+
+    This depends on the environment instead of the config file, hence it is
+    checked on each load of the parameters, including from the cache.
+
+    Args:
+        values: A dictionary mapping the name of the parameters to their value.
+
+    Raises:
+        ConfigError: A selected engine is not installed.
+    """
+    check_parameter(
+        values['csv_engine'] != 'pyarrow'
+        or importlib.util.find_spec('pyarrow') is not None,
+        'The csv engine pyarrow is selected but pyarrow is not installed')
+
+
+def _read_params_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+    """Read the parameters from a cache file.
+
+    Args:
+        cache_path: The path to the cache file.
+
+    Returns:
+        A dictionary mapping the name of the parameters to their value, or None
+        if the cache file does not exist or cannot be read.
+    """
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            values = pickle.load(cache_file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    logger.debug(f'Loaded the parameters from the cache {cache_path}')
+    return values
+
+
+def _write_params_cache(values: Dict[str, Any], cache_path: str) -> bool:
+    """Atomically write the parameters to a cache file.
+
+    The parameters are written to a temporary file which is then renamed.
+
+    Args:
+        values: A dictionary mapping the name of the parameters to their value.
+        cache_path: The path to the cache file.
+
+    Returns:
+        Whether the parameters were written to the cache file.
+    """
+    try:
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=CACHE_DIRECTORY, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'wb') as temporary_file:
+            pickle.dump(values, temporary_file)
+        os.replace(temporary_path, cache_path)
+    except OSError as os_error:
+        logger.debug(f'Could not save the parameters to the cache: {os_error}')
+        return False
+    logger.debug(f'Saved the parameters to the cache {cache_path}')
+    _remove_stale_params_caches(cache_path)
+    return True
+
+
+def _remove_stale_params_caches(cache_path: str):
+    """Remove the older cache files of the same config file.
+
+    The cache files of a config file share the hash of its path as the prefix
+    of their name (see _get_params_cache_path), and only the given one is up
+    to date.
+
+    Args:
+        cache_path: The path to the up to date cache file.
+    """
+    cache_file_name = os.path.basename(cache_path)
+    option_file_hash = cache_file_name.split('-')[1]
+    option_file_prefix = f'config-{option_file_hash}-'
+    for stale_file_name in os.listdir(CACHE_DIRECTORY):
+        if (stale_file_name != cache_file_name
+                and stale_file_name.startswith(option_file_prefix)
+                and stale_file_name.endswith('.pkl')):
+            try:
+                os.remove(os.path.join(CACHE_DIRECTORY, stale_file_name))
+            except OSError as os_error:
+                logger.debug('Could not remove the stale cache '
+                             f'{stale_file_name}: {os_error}')
+
+
+def _get_params_cache_path(option_file_path: str) -> str:
+    """Give the path to the cache file of the parameters of a config file.
+
+    The name of the cache file is derived from the path to the config file,
+    from its modification time and its size, and from the modification time of
+    this module. Two copies of the config file (e.g., in two checkouts) then
+    have different cache files, even if they have the same modification time.
+
+    Args:
+        option_file_path: The path to the config file.
+
+    Raises:
+        ConfigError: The config file is missing or is not a regular file.
+
+    Returns:
+        The path to the cache file of the parameters.
+    """
+    # Fail fast if the config file is missing or is not a regular file
+    try:
+        option_file_stat = os.stat(option_file_path)
+    except OSError as os_error:
+        raise ConfigError(f'Cannot access the config file {option_file_path}'
+                          f': {os_error}') from os_error
+    check_parameter(stat.S_ISREG(option_file_stat.st_mode),
+                    f'The config file {option_file_path} is not a file')
+
+    option_file_hash = hashlib.sha256(
+        os.path.abspath(option_file_path).encode()).hexdigest()[:16]
+    cache_key = (f'{option_file_hash}-{option_file_stat.st_mtime_ns}'
+                 f'-{option_file_stat.st_size}')
+
+    # The cached values also depend on the code that parses the config file
+    cache_key += f'-{os.stat(__file__).st_mtime_ns}'
+    return os.path.join(CACHE_DIRECTORY, f'config-{cache_key}.pkl')
+
+
+@functools.lru_cache(maxsize=1)
+def _load_params(option_file_path: Optional[str] = None) -> Dict[str, Any]:
+    """Load the parameters, from the cache if the config file is unchanged.
+
+    The parsed and checked parameters are pickled in the cache directory under
+    the name given by _get_params_cache_path. When the config file and this
+    module are left unchanged, the parameters are directly loaded from this
+    cache instead of being parsed and checked again. The cache path is computed
+    again by each process (e.g., the child processes or the reloaded Flask
+    server), so that stale parameters are never loaded.
+
+    Args:
+        option_file_path: The path to the config file, which defaults to the
+                          config.ini file at the root of the repository.
+
+    Returns:
+        A dictionary mapping the name of the parameters to their value.
+    """
+    if option_file_path is None:
+        brfast_root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        option_file_path = os.path.join(brfast_root, OPTION_FILE_NAME)
+    cache_path = _get_params_cache_path(option_file_path)
+
+    # Cache miss: parse and check the config file, then save the values
+    values = _read_params_cache(cache_path)
+    if values is None:
+        values = _parse_params(option_file_path)
+        _write_params_cache(values, cache_path)
+    _check_installed_engines(values)
+    return values
+
+
+# The sections that are loaded and checked on the first access to one of their
+# parameters, with the name of their parameters
+_LAZY_SECTIONS = [
+    (_load_webserver, frozenset({
+        'upload_foler', 'secret_key_size', 'fingerprint_sample_size',
+        'bootstrap_progess_bars',
+        'flash_classes', 'fpselect_default_explored_paths',
+        'fpselect_minimum_explored_paths', 'fpselect_maximum_explored_paths',
+        'fpselect_step_explored_paths', 'fpselect_explored_paths_range',
+        'top_k_fingerprints_sensitivity_measure_default_k',
+        'top_k_fingerprints_sensitivity_measure_min_k',
+        'top_k_fingerprints_sensitivity_measure_max_k',
+        'top_k_fingerprints_sensitivity_measure_step_k',
+        'top_k_fingerprints_range'})),
+    (_load_visualization, frozenset({
+        'float_precision', 'collected_nodes_step', 'collect_frequency',
+        'nodes_limit', 'link_width', 'link_opacity', 'link_colour',
+        'node_radius', 'node_collision_radius_multiplicator'})),
+    (_load_nodecolour, frozenset({'node_colours'}))
+]
+
+
+def _load_frozen_parameters(params: configparser.ConfigParser
+                            ) -> Dict[str, Any]:
+    """Freeze the checked parameters of the lazily loaded sections.
+
+    The sections that are not loaded yet are loaded and checked. Their
+    parameters are then gathered in a named tuple, so that they are accessed
+    as attributes (e.g., CFG.node_radius) and cannot be modified.
+
+    Args:
+        params: The parsed config file.
+
+    Returns:
+        A dictionary mapping CFG to the frozen parameters.
+    """
+    values = {}
+    for section_loader, parameter_names in _LAZY_SECTIONS:
+        if not parameter_names <= globals().keys():
+            globals().update(section_loader(params))
+        values.update((name, globals()[name]) for name in parameter_names)
+    values['bootstrap_progress_bars'] = get_bootstrap_progress_bars()
+    for mapping in ('flash_classes', 'node_colours'):
+        values[mapping] = types.MappingProxyType(values[mapping])
+
+    frozen_parameters = collections.namedtuple('FrozenParameters',
+                                               sorted(values))
+    return {'CFG': frozen_parameters(**values)}
+
+
+# The parameters that are loaded on their first access, with the loader that
+# sets them
+_LAZY_PARAMETERS = _LAZY_SECTIONS + [
+    (_load_frozen_parameters, frozenset({'CFG'}))
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Give a parameter of a lazily loaded section (PEP 562).
+
+    The section of the parameter is loaded and checked on the first access to
+    one of its parameters, and its parameters are then set in this module.
+
+    Args:
+        name: The name of the parameter.
+
+    Raises:
+        AttributeError: There is no parameter with this name.
+
+    Returns:
+        The value of the parameter.
+    """
+    for section_loader, parameter_names in _LAZY_PARAMETERS:
+        if name in parameter_names:
+            globals().update(section_loader(globals()['params']))
+            return globals()[name]
+    raise AttributeError(f'module {__name__} has no attribute {name}')
+
+
+@functools.lru_cache(maxsize=1)
+def get_bootstrap_progress_bars() -> Tuple[str, ...]:
+    """Give the classes of the bootstrap progress bars.
+
+    The raw parameter is only split on the first call.
+
+    Returns:
+        The classes of the bootstrap progress bars, one per line of the
+        WebServer.bootstrap_progess_bars parameter.
+    """
+    bootstrap_progess_bars = (globals().get('bootstrap_progess_bars')
+                              or __getattr__('bootstrap_progess_bars'))
+    return tuple(bootstrap_progess_bars.splitlines())
+
+
+# The configuration of BrFAST is stored in the params object. It is loaded a
+# single time, even if this module is reloaded.
+if not globals().get('_LOADED', False):
+    _loaded_values = _load_params()
+    globals().update(_loaded_values)
+
+    # Set the modin engine, unless it is already set (e.g., inherited from the
+    # parent process)
+    _modin_engine = _loaded_values['modin_engine']
+    if (_loaded_values['analysis_engine'] == 'modin.pandas'
+            and os.environ.get('MODIN_ENGINE') != _modin_engine):
+        os.environ['MODIN_ENGINE'] = _modin_engine
+
+    _LOADED = True
@@ -1,9 +1,9 @@
 #!/usr/bin/python3
 """brfast.data.attribute module: Classes related to the attributes."""
 
-from typing import Iterable, Iterator, List, Optional
-
-from sortedcontainers import SortedDict
+from functools import total_ordering
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from weakref import WeakValueDictionary
 
 
 # ============================== Utility classes ==============================
@@ -12,12 +12,20 @@ class DuplicateAttributeId(Exception):
 
 
 # ========================= Attribute related classes =========================
+@total_ordering
 class Attribute:
     """The Attribute class that represents a browser fingerprinting attribute.
 
-    The attributes should have a unique identifier.
+    The attributes should have a unique identifier, by which they are ordered.
     """
 
+    __slots__ = ('_attribute_id', '_name', '__weakref__')
+
+    # The attributes shared by get_or_create() by their id and name. They are
+    # weakly referenced, hence removed once no dataset holds them anymore.
+    _registry: 'WeakValueDictionary[Tuple[int, str], Attribute]' = (
+        WeakValueDictionary())
+
     def __init__(self, attribute_id: int, name: str):
         """Initialize the Attribute object with its id and its name.
 
@@ -28,6 +36,28 @@ class Attribute:
         self._attribute_id = attribute_id
         self._name = name
 
+    @classmethod
+    def get_or_create(cls, attribute_id: int, name: str) -> 'Attribute':
+        """Give the attribute of this id and name, creating it if needed.
+
+        The attributes obtained by this method are shared, so that the
+        datasets having the same attributes do not hold copies of them.
+
+        Args:
+            attribute_id: The unique id of the attribute.
+            name: The name of the attribute.
+
+        Returns:
+            The attribute having this id and this name.
+        """
+        registry_key = (attribute_id, name)
+        attribute = cls._registry.get(registry_key)
+        if attribute is None:
+            # The attribute registered first is kept if two threads create it
+            attribute = cls._registry.setdefault(
+                registry_key, cls(attribute_id, name))
+        return attribute
+
     def __repr__(self) -> str:
         """Provide a string representation of the attribute.
 
@@ -70,9 +100,11 @@ class Attribute:
 
         Returns:
             The attributes are the same (i.e., they share the same id).
+            NotImplemented if the parameter is not of the same class.
         """
-        return (isinstance(other_attribute, self.__class__)
-                and self._attribute_id == other_attribute.attribute_id)
+        if type(other_attribute) is not type(self):
+            return NotImplemented
+        return self._attribute_id == other_attribute._attribute_id
 
     def __lt__(self, other_attribute: 'Attribute') -> bool:
         """Compare the attribute with another one using the "<" operator.
@@ -89,12 +121,15 @@ class Attribute:
         """
         if not isinstance(other_attribute, self.__class__):
             return NotImplemented
-        return self.attribute_id < other_attribute.attribute_id
+        return self._attribute_id < other_attribute._attribute_id
 
 
 class AttributeSet:
     """The AttributeSet class that represents an attribute set."""
 
+    __slots__ = ('_id_to_attr', '_name_to_attr', '_sorted_ids',
+                 '_sorted_names', '_hash')
+
     def __init__(self, attributes: Optional[Iterable[Attribute]] = None):
         """Initialize the AttributeSet object with the attributes.
 
@@ -104,12 +139,41 @@ class AttributeSet:
         Raises:
             DuplicateAttributeId: Two attributes share the same id.
         """
-        # Maintain a sorted dictionary linking the attributes id to the
-        # attribute objects
-        self._id_to_attr = SortedDict()
-        if attributes:
-            for attribute in attributes:
-                self.add(attribute)
+        # Maintain the dictionaries linking the attributes id and name to the
+        # attribute objects, and the sorted ids and names which are computed
+        # on demand
+        self._id_to_attr: Dict[int, Attribute] = {}
+        self._name_to_attr: Dict[str, Attribute] = {}
+        self._sorted_ids: Optional[Tuple[int, ...]] = None
+        self._sorted_names: Optional[Tuple[str, ...]] = None
+        self._hash: Optional[int] = None
+        if isinstance(attributes, AttributeSet):
+            # Copy the dictionaries and the cached values of the other
+            # attribute set, which has no duplicated id by construction
+            self._id_to_attr = dict(attributes._id_to_attr)
+            self._name_to_attr = dict(attributes._name_to_attr)
+            self._sorted_ids = attributes._sorted_ids
+            self._sorted_names = attributes._sorted_names
+            self._hash = attributes._hash
+        elif attributes:
+            # Build the dictionaries at once, the duplicated ids being detected
+            # by the size of the dictionary
+            attributes = tuple(attributes)
+            self._id_to_attr = {attribute.attribute_id: attribute
+                                for attribute in attributes}
+            if len(self._id_to_attr) != len(attributes):
+                seen_ids = set()
+                for attribute in attributes:
+                    if attribute.attribute_id in seen_ids:
+                        raise DuplicateAttributeId(
+                            'An attribute with the same id as '
+                            f'{attribute} already exists.')
+                    seen_ids.add(attribute.attribute_id)
+            # The name of several attributes refers to the one of lowest id
+            self._sorted_ids = tuple(sorted(self._id_to_attr))
+            for attribute_id in self._sorted_ids:
+                attribute = self._id_to_attr[attribute_id]
+                self._name_to_attr.setdefault(attribute.name, attribute)
 
     def __iter__(self) -> Iterator:
         """Give the iterator for the AttributeSet to get the attributes.
@@ -118,7 +182,8 @@ class AttributeSet:
             An iterator that iterates over the Attribute objects that compose
             the attribute set.
         """
-        return iter(self._id_to_attr.values())
+        return (self._id_to_attr[attribute_id]
+                for attribute_id in self._get_sorted_ids())
 
     def __repr__(self) -> str:
         """Provide a string representation of the attribute set.
@@ -126,8 +191,7 @@ class AttributeSet:
         Returns:
             A string representation of the attribute set.
         """
-        attribute_list = ', '.join(str(attr)
-                                   for attr in self._id_to_attr.values())
+        attribute_list = ', '.join(str(attr) for attr in self)
         return f'{self.__class__.__name__}([{attribute_list}])'
 
     @property
@@ -139,7 +203,11 @@ class AttributeSet:
         Returns:
             The name of the attributes of this attribute set as a list of str.
         """
-        return list(attribute.name for attribute in self._id_to_attr.values())
+        if self._sorted_names is None:
+            self._sorted_names = tuple(
+                self._id_to_attr[attribute_id].name
+                for attribute_id in self._get_sorted_ids())
+        return list(self._sorted_names)
 
     @property
     def attribute_ids(self) -> List[int]:
@@ -148,7 +216,20 @@ class AttributeSet:
         Returns:
             The ids of the attributes of this set as a sorted list of integers.
         """
-        return list(self._id_to_attr.keys())
+        return list(self._get_sorted_ids())
+
+    def _get_sorted_ids(self) -> Tuple[int, ...]:
+        """Give the sorted ids of the attributes, sorting them if needed.
+
+        The sorted ids are cached until the attribute set is modified.
+
+        Returns:
+            The ids of the attributes of this set as a sorted tuple of
+            integers.
+        """
+        if self._sorted_ids is None:
+            self._sorted_ids = tuple(sorted(self._id_to_attr))
+        return self._sorted_ids
 
     def add(self, attribute: Attribute):
         """Add an attribute to this attribute set if it is not already present.
@@ -164,6 +245,11 @@ class AttributeSet:
             raise DuplicateAttributeId('An attribute with the same id as '
                                        f'{attribute} already exists.')
         self._id_to_attr[attribute.attribute_id] = attribute
+        same_name_attribute = self._name_to_attr.get(attribute.name)
+        if (same_name_attribute is None
+                or attribute.attribute_id < same_name_attribute.attribute_id):
+            self._name_to_attr[attribute.name] = attribute
+        self._sorted_ids = self._sorted_names = self._hash = None
 
     def remove(self, attribute: Attribute):
         """Remove an attribute from this attribute set.
@@ -176,15 +262,32 @@ class AttributeSet:
         """
         if attribute.attribute_id not in self._id_to_attr:
             raise KeyError(f'{attribute} is not among the attributes.')
-        del self._id_to_attr[attribute.attribute_id]
+        removed_attribute = self._id_to_attr.pop(attribute.attribute_id)
+        removed_name = removed_attribute.name
+        if self._name_to_attr.get(removed_name) is removed_attribute:
+            # The name now refers to the remaining attribute of lowest id that
+            # has this name, if there is one
+            same_name_attributes = [
+                remaining_attribute
+                for remaining_attribute in self._id_to_attr.values()
+                if remaining_attribute.name == removed_name]
+            if same_name_attributes:
+                self._name_to_attr[removed_name] = min(same_name_attributes)
+            else:
+                del self._name_to_attr[removed_name]
+        self._sorted_ids = self._sorted_names = self._hash = None
 
     def __hash__(self) -> int:
         """Give the hash of an attribute set: the hash of its attributes.
 
+        The hash is cached until the attribute set is modified.
+
         Returns:
             The hash of an attribute set as the hash of its frozen attributes.
         """
-        return hash(frozenset(self.attribute_ids))
+        if self._hash is None:
+            self._hash = hash(frozenset(self._id_to_attr))
+        return self._hash
 
     def __eq__(self, other_attr_set: 'AttributeSet') -> bool:
         """Compare two attribute sets, equal if the attributes correspond.
@@ -195,9 +298,14 @@ class AttributeSet:
 
         Returns:
             The two attribute sets are equal: they share the same attributes.
+            NotImplemented if the parameter is not of the same class.
         """
-        return (isinstance(other_attr_set, self.__class__)
-                and hash(self) == hash(other_attr_set))
+        if other_attr_set is self:
+            return True
+        if type(other_attr_set) is not type(self):
+            return NotImplemented
+        # The comparison of the keys views first compares their size
+        return self._id_to_attr.keys() == other_attr_set._id_to_attr.keys()
 
     def __contains__(self, attribute: Attribute) -> bool:
         """Check if the attribute is in the attribute set.
@@ -228,9 +336,8 @@ class AttributeSet:
         Returns:
             The attribute set is a superset of the other attribute set.
         """
-        self_attribute_ids_set = frozenset(self.attribute_ids)
-        other_attribute_ids_set = frozenset(other_attribute_set.attribute_ids)
-        return self_attribute_ids_set.issuperset(other_attribute_ids_set)
+        return (self._id_to_attr.keys()
+                >= other_attribute_set._id_to_attr.keys())
 
     def issubset(self, other_attribute_set: 'AttributeSet') -> bool:
         """Check if the attribute set is a subset of the one in parameters.
@@ -242,9 +349,8 @@ class AttributeSet:
         Returns:
             The attribute set is a subset of the other attribute set.
         """
-        self_attribute_ids_set = frozenset(self.attribute_ids)
-        other_attribute_ids_set = frozenset(other_attribute_set.attribute_ids)
-        return self_attribute_ids_set.issubset(other_attribute_ids_set)
+        return (self._id_to_attr.keys()
+                <= other_attribute_set._id_to_attr.keys())
 
     def get_attribute_by_id(self, attribute_id: int) -> Attribute:
         """Give an attribute by its id.
@@ -268,7 +374,6 @@ class AttributeSet:
         Raises:
             KeyError: The attribute is not present in this attribute set.
         """
-        for attribute in self._id_to_attr.values():
-            if attribute.name == name:
-                return attribute
-        raise KeyError(f'No attribute is named {name}.')
+        if name not in self._name_to_attr:
+            raise KeyError(f'No attribute is named {name}.')
+        return self._name_to_attr[name]
@@ -4,13 +4,39 @@
 import importlib
 from io import TextIOWrapper
 from os import path
+from threading import Lock
+from typing import Any, Dict, Tuple, TYPE_CHECKING
 
+import numpy as np
+import pandas
 from loguru import logger
 
 # Import the engine of the analysis module (pandas or modin)
+from brfast import config
 from brfast.config import params
 from brfast.data.attribute import Attribute, AttributeSet
-pd = importlib.import_module(params.get('DataAnalysis', 'engine'))
+_ENGINE = params.get('DataAnalysis', 'engine')
+pd = pandas if _ENGINE == 'pandas' else importlib.import_module(_ENGINE)
+_read_csv = pd.read_csv
+
+# The index of a modin dataframe is a pandas index, hence the MultiIndex class
+# of pandas is used to check it whatever the engine
+_MultiIndex = pandas.MultiIndex
+
+# pyarrow is an optional dependency only used for the type hints
+if TYPE_CHECKING:
+    import pyarrow
+
+# The parameters to read the csv files for each csv engine of the
+# DataAnalysis.csv_engine parameter
+CSV_ENGINE_READ_PARAMETERS = {
+    'c': {'engine': 'c', 'index_col': False},
+    'pyarrow': {'engine': 'pyarrow'}
+}
+
+# The maximum ratio of distinct values over the number of values of a string
+# column for it to be stored as a categorical column
+CATEGORY_MAX_DISTINCT_RATIO = 0.5
 
 
 # ============================== Utility classes ==============================
@@ -19,13 +45,134 @@ class MetadataField:
 
     BROWSER_ID = 'browser_id'
     TIME_OF_COLLECT = 'time_of_collect'
-    ALL = {BROWSER_ID, TIME_OF_COLLECT}
+    ALL = frozenset({BROWSER_ID, TIME_OF_COLLECT})
 
 
 class MissingMetadatasFields(Exception):
     """The required metadatas columns are missing from the dataset."""
 
 
+# The metadata fields, bound at the module level as they are used on every
+# access to the indices of the datasets
+_BROWSER_ID = MetadataField.BROWSER_ID
+_TIME_OF_COLLECT = MetadataField.TIME_OF_COLLECT
+_REQUIRED_METADATA_FIELDS = MetadataField.ALL
+
+
+def _set_read_only(dataframe: pd.DataFrame):
+    """Set the values of a dataframe as read-only.
+
+    The numpy arrays backing the columns are flagged as non-writeable, so that
+    modifying the values in place raises a ValueError. The categorical columns
+    are backed by the read-only view of their codes. The other columns and the
+    dataframes that are not backed by numpy arrays (e.g., modin dataframes)
+    are left unchanged.
+
+    Args:
+        dataframe: The dataframe to set as read-only.
+    """
+    block_manager = getattr(dataframe, '_mgr', None)
+    for block in getattr(block_manager, 'blocks', ()):
+        if isinstance(block.values, np.ndarray):
+            block.values.flags.writeable = False
+        elif isinstance(block.values, pandas.Categorical):
+            block.values = pandas.Categorical.from_codes(
+                block.values.codes, dtype=block.values.dtype)
+
+
+def _read_only_view(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Give a read-only view of a dataframe.
+
+    The view shares the values of the dataframe without copying them, but the
+    arrays backing its columns are distinct array objects, hence only the view
+    is set as read-only and the dataframe is left writable. The columns backed
+    by other extension arrays than the categorical ones are copied, so that
+    modifying them does not modify the dataframe.
+
+    Args:
+        dataframe: The dataframe of which to give a read-only view.
+
+    Returns:
+        A read-only view of the dataframe.
+    """
+    view = dataframe.copy(deep=False)
+    block_manager = getattr(view, '_mgr', None)
+    for block in getattr(block_manager, 'blocks', ()):
+        if isinstance(block.values, np.ndarray):
+            block.values = block.values.view()
+        elif not isinstance(block.values, pandas.Categorical):
+            block.values = block.values.copy()
+    _set_read_only(view)
+    return view
+
+
+def _categorize_string_columns(dataframe: pd.DataFrame):
+    """Convert the string columns of a dataframe to categorical columns.
+
+    The values of a categorical column are stored as integer codes referring
+    to the distinct values, which is lighter than a Python string per value
+    for the attributes that have few distinct values. Only the columns having
+    less distinct values than CATEGORY_MAX_DISTINCT_RATIO times their number
+    of values are converted.
+
+    Args:
+        dataframe: The dataframe of which the string columns are converted.
+    """
+    max_distinct_values = CATEGORY_MAX_DISTINCT_RATIO * len(dataframe)
+    string_columns = [
+        column for column in dataframe.select_dtypes(include='object').columns
+        if dataframe[column].nunique(dropna=False) < max_distinct_values]
+    if string_columns:
+        logger.debug(f'Converting the {len(string_columns)} string columns '
+                     'to categorical columns.')
+        dataframe[string_columns] = dataframe[string_columns].astype(
+            'category')
+
+
+def _set_metadata_indices(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Check the metadata fields of a dataframe and set them as its indices.
+
+    Args:
+        dataframe: The dataframe with a column for each metadata field.
+
+    Raises:
+        MissingMetadatasFields: A required metadata field is missing.
+
+    Returns:
+        The dataframe indexed by the browser_id and time_of_collect fields.
+    """
+    # Check that the necessary metadatas are present
+    for required_metadata in _REQUIRED_METADATA_FIELDS:
+        if required_metadata not in dataframe:
+            raise MissingMetadatasFields(
+                f'The required metadata field {required_metadata} is '
+                'missing from the dataset.')
+
+    # Format the indices
+    dataframe[_TIME_OF_COLLECT] = pd.to_datetime(dataframe[_TIME_OF_COLLECT])
+
+    # Set the indices as 'browser_id' and 'time_of_collect'
+    return dataframe.set_index([_BROWSER_ID, _TIME_OF_COLLECT])
+
+
+def _read_fingerprint_csv(source: Any, **read_parameters: Any
+                          ) -> pd.DataFrame:
+    """Read a csv file of fingerprints and set its metadata as the indices.
+
+    Args:
+        source: The path to the csv file or the file handle of the csv file.
+        read_parameters: The keyword arguments given to read_csv.
+
+    Raises:
+        MissingMetadatasFields: A required metadata field is missing.
+
+    Returns:
+        The dataframe of the fingerprints indexed by the browser_id and
+        time_of_collect fields.
+    """
+    return _set_metadata_indices(_read_csv(source, **read_parameters))
+
+
 # ==================== Fingerprint dataset related classes ====================
 class FingerprintDataset:
     """A fingerprint dataset (abstract class)."""
@@ -34,19 +181,27 @@ class FingerprintDataset:
         """Initialize."""
         self._dataframe, self._candidate_attributes = None, None
 
-        # The dataframes with a single fingerprint per browser, lazily computed
+        # The dataframes with a single fingerprint per browser, both lazily
+        # computed at once under a lock as the dataset can be shared by the
+        # threads of the web server
         self._first_fp_df, self._last_fp_df = None, None
+        self._one_fp_dfs_lock = Lock()
 
         # Process the dataset
         self._process_dataset()
 
         # Check that the necessary metadatas are present
-        required_metadatas = MetadataField.ALL
-        if not (isinstance(self._dataframe.index, pd.MultiIndex)
-                and required_metadatas.issubset(self._dataframe.index.names)):
+        if (not isinstance(self._dataframe.index, _MultiIndex)
+                or not _REQUIRED_METADATA_FIELDS.issubset(
+                    self._dataframe.index.names)):
             raise MissingMetadatasFields(
                 'The required metadata fields and indices '
-                f'{required_metadatas} are missing from the dataset.')
+                f'{sorted(_REQUIRED_METADATA_FIELDS)} are missing from the '
+                'dataset.')
+
+        # Store the string attributes as categories if configured to
+        if config.categorize_strings:
+            _categorize_string_columns(self._dataframe)
 
         # Set the candidate attributes
         self._set_candidate_attributes()
@@ -59,6 +214,27 @@ class FingerprintDataset:
         """
         return f'{self.__class__.__name__}'
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Give the state of this fingerprint dataset to pickle it.
+
+        The lock cannot be pickled, hence it is removed from the state.
+
+        Returns:
+            The attributes of this fingerprint dataset without the lock.
+        """
+        state = self.__dict__.copy()
+        del state['_one_fp_dfs_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        """Restore the state of an unpickled fingerprint dataset.
+
+        Args:
+            state: The attributes of the fingerprint dataset without the lock.
+        """
+        self.__dict__.update(state)
+        self._one_fp_dfs_lock = Lock()
+
     def _process_dataset(self):
         """Process the dataset to obtain a DataFrame from the file.
 
@@ -83,6 +259,21 @@ class FingerprintDataset:
         """
         raise NotImplementedError
 
+    def _set_candidate_attributes_from_columns(self):
+        """Set the candidate attributes from the columns of the DataFrame.
+
+        Each column is an attribute named after the column, with the position
+        of the column (starting from 1) as its id. The browser_id and
+        time_of_collect fields are indices, hence they are not among the
+        columns. The attributes are shared with the other datasets having the
+        same columns. The column names are converted to a list at once, as
+        iterating over an Index converts each name separately.
+        """
+        self._candidate_attributes = AttributeSet(
+            Attribute.get_or_create(column_id, column)
+            for column_id, column in enumerate(
+                self._dataframe.columns.tolist(), 1))
+
     @property
     def dataframe(self) -> pd.DataFrame:
         """Give the fingerprint dataset as a DataFrame.
@@ -112,92 +303,83 @@ class FingerprintDataset:
 
         Returns:
             A dataframe with only one fingerprint per browser, which is the
-            first or the last one.
+            first or the last one. It is shared between the callers, hence its
+            values are read-only and it has to be copied to be modified.
         """
-        # Last fingerprint
-        if last_fingerprint:
-
-            logger.debug(f'Getting the dataframe {self} with the last '
-                         'fingerprint only for each browser')
-
-            if self._last_fp_df is None:
-                logger.debug(f'Generate the dataframe {self} with the last'
-                             ' fingerprint only for each browser')
-                self._last_fp_df = self._preprocess_one_fp_per_browser(
-                    last_fingerprint)
-
-                # If the two dataframes have the same length, they are
-                # equal (i.e., no duplicates were removed). We just
-                # reference the dataframe to save memory.
-                if len(self._last_fp_df) == len(self._dataframe):
-                    logger.debug('The two dataframes are equal, '
-                                 '_last_fp_df is then the input dataframe')
-                    self._last_fp_df = self._dataframe
-
-            # Return the resulting DataFrame
-            return self._last_fp_df
-
-        # First fingerprint
-        logger.debug(f'Getting the dataframe {self} with the first '
-                     'fingerprint only for each browser')
-
-        if self._first_fp_df is None:
-            logger.debug(f'Generate the dataframe {self} with the first '
-                         'fingerprint only for each browser')
-            self._first_fp_df = self._preprocess_one_fp_per_browser(
-                last_fingerprint)
-
-            # If the two dataframes have the same length, they are
-            # equal (i.e., no duplicates were removed). We just
-            # reference the dataframe to save memory.
-            if len(self._first_fp_df) == len(self._dataframe):
-                logger.debug('The two dataframes are equal, '
-                             '_first_fp_df is then the input dataframe')
-                self._first_fp_df = self._dataframe
-
-        # Return the resulting DataFrame
-        return self._first_fp_df
-
-    def _preprocess_one_fp_per_browser(self, last_fingerprint: bool = True
-                                       ) -> pd.DataFrame:
+        # The dataframes are read without the lock once they are computed
+        one_fp_df = self._last_fp_df if last_fingerprint else self._first_fp_df
+        if one_fp_df is None:
+            with self._one_fp_dfs_lock:
+                if self._last_fp_df is None:
+                    self._precompute_both_fp_caches()
+            one_fp_df = (self._last_fp_df if last_fingerprint
+                         else self._first_fp_df)
+        return one_fp_df
+
+    def _precompute_both_fp_caches(self):
+        """Compute the dataframes holding the first and the last fingerprints.
+
+        Both dataframes are obtained from a single sort of the fingerprints.
+        The dataframe of the last fingerprints is set after the one of the
+        first fingerprints, hence it marks that both are available.
+        """
+        logger.debug('Generate the dataframes {} with the first and the last '
+                     'fingerprint only for each browser', self)
+        first_fp_df, last_fp_df = self._preprocess_one_fp_per_browser()
+
+        # If a dataframe has the same length as the dataset, they are equal
+        # (i.e., no duplicates were removed). We just reference a read-only
+        # view of the dataset to save memory, the dataset staying writable.
+        if len(first_fp_df) == len(self._dataframe):
+            logger.debug('The dataset has a single fingerprint per browser, '
+                         'the dataframes with the first and the last '
+                         'fingerprint of each browser are a view of the '
+                         'dataset')
+            first_fp_df = last_fp_df = _read_only_view(self._dataframe)
+        else:
+            _set_read_only(first_fp_df)
+            _set_read_only(last_fp_df)
+        self._first_fp_df = first_fp_df
+        self._last_fp_df = last_fp_df
+
+    def _preprocess_one_fp_per_browser(self
+                                       ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Preprocess this fingerprint dataset to hold a single fp per browser.
 
-        Args:
-            last_fingerprint: Whether we should only hold the last fingerprint
-                              of each user, otherwise it is the first
-                              fingerprint.
-
         Returns:
-            A dataframe with only one fingerprint per browser, which is the
-            first or the last one.
+            A pair of dataframes with only one fingerprint per browser, which
+            is the first one for the first dataframe and the last one for the
+            second dataframe.
         """
-        which_fp_to_hold = 'last' if last_fingerprint else 'first'
         logger.debug('Preprocessing the dataset to hold a single fingerprint '
-                     f'per browser, taking the {which_fp_to_hold} '
-                     'fingerprint.')
-
-        # If the dataframe is empty, just return it
-        if self._dataframe.empty:
-            logger.debug('The given dataframe is empty, returning the '
-                         'dataframe without modifying it.')
-            return self._dataframe
-
-        # 1. We group the fingerprints (=rows) by the browser id. As we do not
-        #    care about the order of the browser ids, we turn the sorting off
-        #    for better performances. We need to disable the group keys to not
-        #    have an additional index with the value of the index 'browser_id'.
-        grouped_by_browser = self._dataframe.groupby(
-            MetadataField.BROWSER_ID, sort=False, group_keys=False)
-
-        # 2. For each group (= a browser id), we sort the fingerprints by the
-        #    time they were collected at. If we want the last fingerprint, then
-        #    we sort them in descending manner (= not ascending) to have the
-        #    latest first.
-        # 3. We only hold a fingerprint for each group, hence for each browser.
-        return grouped_by_browser.apply(
-            lambda row: row.sort_values(MetadataField.TIME_OF_COLLECT,
-                                        ascending=not last_fingerprint)
-                           .head(1))
+                     'per browser.')
+
+        # If the dataframe is empty, or if there is already a single
+        # fingerprint per browser, just return it
+        browser_ids = self._dataframe.index.get_level_values(_BROWSER_ID)
+        if self._dataframe.empty or browser_ids.is_unique:
+            logger.debug('The given dataframe is empty or has a single '
+                         'fingerprint per browser, returning the dataframe '
+                         'without modifying it.')
+            return self._dataframe, self._dataframe
+
+        # 1. We sort the fingerprints (=rows) by their browser id and then by
+        #    the time they were collected at. The browser ids are replaced by
+        #    their codes sorted by id, so that the sort only runs on two
+        #    integer arrays.
+        browser_codes, _ = pandas.factorize(browser_ids, sort=True)
+        times_of_collect = np.asarray(self._dataframe.index.get_level_values(
+            _TIME_OF_COLLECT))
+        sorted_positions = np.lexsort((times_of_collect, browser_codes))
+
+        # 2. The last fingerprint of a browser is just before a change of
+        #    browser between two consecutive sorted fingerprints, and the
+        #    first fingerprint of the next browser is just after it.
+        group_ends = np.flatnonzero(np.diff(browser_codes[sorted_positions]))
+        last_positions = np.append(group_ends, len(sorted_positions) - 1)
+        first_positions = np.insert(group_ends + 1, 0, 0)
+        return (self._dataframe.iloc[sorted_positions[first_positions]],
+                self._dataframe.iloc[sorted_positions[last_positions]])
 
 
 class FingerprintDatasetFromFile(FingerprintDataset):
@@ -248,10 +430,7 @@ class FingerprintDatasetFromFile(FingerprintDataset):
         This implementation generates the candidate attributes from the columns
         of the DataFrame, ignoring the browser_id and time_of_collect fields.
         """
-        self._candidate_attributes = AttributeSet()
-        for column_id, column in enumerate(self._dataframe.columns, 1):
-            attribute = Attribute(column_id, column)
-            self._candidate_attributes.add(attribute)
+        self._set_candidate_attributes_from_columns()
 
     @property
     def dataset_path(self) -> str:
@@ -280,26 +459,10 @@ class FingerprintDatasetFromCSVFile(FingerprintDatasetFromFile):
         This implementation generates a DataFrame from the csv stored at
         self._dataset_path with the two indices set.
         """
-        # Read the file from a csv
-        # + Parse the 'time_of_collect' column as a date with the option
-        #   infer_datetime_format activated for performances
-        self._dataframe = pd.read_csv(self._dataset_path, index_col=False)
-
-        # Check that the necessary metadatas are present
-        for required_metadata in MetadataField.ALL:
-            if required_metadata not in self._dataframe:
-                raise MissingMetadatasFields(
-                    f'The required metadata field {required_metadata} is '
-                    'missing from the dataset.')
-
-        # Format the indices
-        self._dataframe[MetadataField.TIME_OF_COLLECT] = pd.to_datetime(
-            self._dataframe[MetadataField.TIME_OF_COLLECT])
-
-        # Set the indices as 'browser_id' and 'time_of_collect'
-        self._dataframe.set_index(
-            [MetadataField.BROWSER_ID, MetadataField.TIME_OF_COLLECT],
-            inplace=True)
+        # The csv engine checked when the parameters were loaded
+        self._dataframe = _read_fingerprint_csv(
+            self._dataset_path,
+            **CSV_ENGINE_READ_PARAMETERS[config.csv_engine])
 
 
 class FingerprintDatasetFromCSVInMemory(FingerprintDataset):
@@ -328,26 +491,8 @@ class FingerprintDatasetFromCSVInMemory(FingerprintDataset):
         This implementation generates a DataFrame from the csv stored in memory
         with the two indices set.
         """
-        # Read the file from the in memory csv file
-        # + Parse the 'time_of_collect' column as a date with the option
-        #   infer_datetime_format activated for performances
-        self._dataframe = pd.read_csv(self._file_handle, index_col=False)
-
-        # Check that the necessary metadatas are present
-        for required_metadata in MetadataField.ALL:
-            if required_metadata not in self._dataframe:
-                raise MissingMetadatasFields(
-                    f'The required metadata field {required_metadata} is '
-                    'missing from the dataset.')
-
-        # Format the indices
-        self._dataframe[MetadataField.TIME_OF_COLLECT] = pd.to_datetime(
-            self._dataframe[MetadataField.TIME_OF_COLLECT])
-
-        # Set the indices as 'browser_id' and 'time_of_collect'
-        self._dataframe.set_index(
-            [MetadataField.BROWSER_ID, MetadataField.TIME_OF_COLLECT],
-            inplace=True)
+        self._dataframe = _read_fingerprint_csv(self._file_handle,
+                                                index_col=False)
 
         # Remove the file handle as it is not needed anymore and cannot be
         # pickled
@@ -359,7 +504,70 @@ class FingerprintDatasetFromCSVInMemory(FingerprintDataset):
         This implementation generates the candidate attributes from the columns
         of the DataFrame, ignoring the browser_id and time_of_collect fields.
         """
-        self._candidate_attributes = AttributeSet()
-        for column_id, column in enumerate(self._dataframe.columns, 1):
-            attribute = Attribute(column_id, column)
-            self._candidate_attributes.add(attribute)
+        self._set_candidate_attributes_from_columns()
+
+
+class FingerprintDatasetFromParquetFile(FingerprintDatasetFromFile):
+    """A fingerprint dataset read from a parquet file."""
+
+    def _process_dataset(self):
+        """Process the dataset to obtain a DataFrame from the file.
+
+        - The resulting fingerprint dataset is stored in self._dataframe.
+        - The fingerprint dataset has to be a DataFrame with the two
+          indices being browser_id (int64) and time_of_collect (datetime64).
+        - The columns are named after the attributes and have the value
+          collected for the browser browser_id at the time time_of_collect.
+        - The name of each column should correspond to the attribute.name
+          property of an attribute of the candidate attributes.
+
+        This implementation generates a DataFrame from the parquet file stored
+        at self._dataset_path with the two indices set. The columnar file is
+        read without any parsing of the values.
+        """
+        self._dataframe = _set_metadata_indices(
+            pd.read_parquet(self._dataset_path))
+
+
+class FingerprintDatasetFromArrowTable(FingerprintDataset):
+    """A fingerprint dataset read from an Arrow table."""
+
+    def __init__(self, table: 'pyarrow.Table'):
+        """Initialize with the Arrow table holding the fingerprints.
+
+        Args:
+            table: The Arrow table holding the fingerprints, with a column for
+                   each metadata field and for each attribute.
+        """
+        self._table = table
+        super().__init__()
+
+    def _process_dataset(self):
+        """Process the dataset to obtain a DataFrame from the Arrow table.
+
+        - The resulting fingerprint dataset is stored in self._dataframe.
+        - The fingerprint dataset has to be a DataFrame with the two
+          indices being browser_id (int64) and time_of_collect (datetime64).
+        - The columns are named after the attributes and have the value
+          collected for the browser browser_id at the time time_of_collect.
+        - The name of each column should correspond to the attribute.name
+          property of an attribute of the candidate attributes.
+
+        This implementation converts the Arrow table to a DataFrame with the
+        two indices set, without parsing any value.
+        """
+        dataframe = self._table.to_pandas()
+        if pd is not pandas:
+            dataframe = pd.DataFrame(dataframe)
+        self._dataframe = _set_metadata_indices(dataframe)
+
+        # Remove the table as it is not needed anymore
+        del self._table
+
+    def _set_candidate_attributes(self):
+        """Set the candidate attributes.
+
+        This implementation generates the candidate attributes from the columns
+        of the DataFrame, ignoring the browser_id and time_of_collect fields.
+        """
+        self._set_candidate_attributes_from_columns()
@@ -4,17 +4,45 @@
 import json
 from datetime import datetime, timedelta
 from enum import IntEnum
-from multiprocessing import Manager, Process
-from typing import Any, Dict, List, Optional, Set
+from multiprocessing import Process, Queue
+from queue import Empty
+from threading import Thread
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
-from sortedcontainers import SortedDict, SortedList
 
 from brfast.config import ANALYSIS_ENGINES, params
 from brfast.data.attribute import AttributeSet
 from brfast.data.dataset import FingerprintDataset
 from brfast.measures import SensitivityMeasure, UsabilityCostMeasure
 
+# The time in seconds after which the reception of the updates of an
+# asynchronous exploration checks whether its process is still running
+UPDATES_RECEPTION_TIMEOUT = 1.0
+
+# The updates of an asynchronous exploration are sent by batches, a batch
+# being sent when it reaches this size or when the previous one was sent this
+# number of seconds ago
+UPDATES_BATCH_SIZE = 1000
+UPDATES_SENDING_INTERVAL = 0.1
+
+
+def get_elapsed_time(start_counter: float) -> timedelta:
+    """Give the time elapsed since a value of the performance counter.
+
+    The performance counter is monotonic and cheaper to read than the current
+    date. It is shared by the processes of a system, hence the elapsed time can
+    be measured by the worker processes of an exploration.
+
+    Args:
+        start_counter: The value of time.perf_counter() at the start.
+
+    Returns:
+        The time elapsed since the start as a timedelta.
+    """
+    return timedelta(seconds=perf_counter() - start_counter)
+
 
 class Exploration:
     """The class of an exploration set with the different parameters."""
@@ -35,21 +63,44 @@ class Exploration:
         self._dataset = dataset
         self._sensitivity_threshold = sensitivity_threshold
 
-        # Create a manager to have a shared memory between the processes
-        self._manager = Manager()
-
-        # The attributes that are shared between the processes and that should
-        # be updated during the exploration
-        self._solution = self._manager.list([None])
-        self._satisfying_attribute_sets = self._manager.list()
-        self._explored_attr_sets = self._manager.list()
+        # The candidate attributes, held as they do not change during the
+        # exploration, and their name by their id in the order of their id
+        self._candidate_attributes = self._dataset.candidate_attributes
+        self._candidate_id_to_name = {
+            attribute.attribute_id: attribute.name
+            for attribute in self._candidate_attributes}
 
-        # The start time and the max cost will be set during the exploration
+        # The description of the measures and of the dataset in the parameters
+        # of the exploration, generated once as they do not change
+        self._component_descriptions = {
+            ExplorationParameters.SENSITIVITY_MEASURE: str(self._sensitivity),
+            ExplorationParameters.USABILITY_COST_MEASURE: str(
+                self._usability_cost),
+            ExplorationParameters.DATASET: str(self._dataset)}
+
+        # The attributes that should be updated during the exploration. When
+        # running asynchronously, the process of the exploration sends each
+        # update through a queue to a thread of this process that applies it.
+        self._solution = [None]
+        self._satisfying_attribute_sets = []
+        self._explored_attr_sets = []
+        self._updates_queue = None
+        self._exploration_process, self._updates_receiver = None, None
+        self._pending_updates, self._last_updates_sending = [], None
+
+        # The sensitivity and the usability cost of the attribute sets that
+        # were evaluated, by the ids of their attributes
+        self._sensitivities, self._usability_costs = {}, {}
+
+        # The start time and the max cost will be set during the exploration.
+        # The start time is also held as a value of the performance counter
+        # to measure the time elapsed when exploring each attribute set.
         self._start_time, self._execution_time = None, None
+        self._start_counter = None
         self._max_cost = float('inf')
 
         # Some info/debug messages
-        candidate_attributes = self._dataset.candidate_attributes
+        candidate_attributes = self._candidate_attributes
         logger.info('Initialized the exploration algorithm '
                     f'{self.__class__.__name__}.')
         logger.info(f'Considering {len(candidate_attributes)} candidate '
@@ -81,7 +132,7 @@ class Exploration:
         logger.info('Start running the exploration in sequential manner...')
 
         # Hold the start time to measure the time taken by each measure
-        self._start_time = datetime.now()
+        self._start_time, self._start_counter = datetime.now(), perf_counter()
         logger.debug(f'Starting the exploration at {self._start_time}.')
 
         # Then, check that the sensitivity threshold is reachable
@@ -89,7 +140,7 @@ class Exploration:
             warning_message = (
                 f'The sensivity threshold of {self._sensitivity_threshold} '
                 'is not reachable even using all the '
-                f'{len(self._dataset.candidate_attributes)} candidate '
+                f'{len(self._candidate_attributes)} candidate '
                 'attributes.')
             logger.warning(warning_message)
             raise SensitivityThresholdUnreachable(warning_message)
@@ -100,7 +151,7 @@ class Exploration:
         self._search_for_solution()
 
         # A little message when the exploration is done
-        self._execution_time = datetime.now() - self._start_time
+        self._execution_time = get_elapsed_time(self._start_counter)
         logger.info(f'The exploration is done after {self._execution_time}.')
         logger.info(f'{len(self._explored_attr_sets)} attribute sets were '
                     'explored, among which '
@@ -116,32 +167,120 @@ class Exploration:
         logger.info('Start running the exploration in asynchronous manner...')
 
         # Hold the start time to measure the time taken by each measure
-        self._start_time = datetime.now()
+        self._start_time, self._start_counter = datetime.now(), perf_counter()
         logger.debug(f'Starting the exploration at {self._start_time}.')
 
-        # Create, start, and return a process that runs the exploration
-        process = Process(target=self._asynchronous_execution)
+        # Create and start a process that runs the exploration, and a thread
+        # that receives the updates that it sends
+        updates_queue = Queue()
+        process = Process(target=self._asynchronous_execution,
+                          args=(updates_queue,))
         process.start()
+        self._exploration_process = process
+        self._updates_receiver = Thread(target=self._receive_updates,
+                                        args=(process, updates_queue),
+                                        daemon=True)
+        self._updates_receiver.start()
         return process
 
-    def _asynchronous_execution(self):
-        """Run the exploration in another process."""
+    def _receive_updates(self, process: Process, updates_queue: Queue):
+        """Receive and apply the updates sent by the process.
+
+        This is executed by a thread of the main process. The updates are
+        appends to the local lists and the replacement of the solution, which
+        are atomic operations.
+
+        Args:
+            process: The process that runs the exploration.
+            updates_queue: The queue through which the updates are sent by
+                           batches of pairs of the name of the update method
+                           and of its argument, None marking the end of the
+                           exploration.
+        """
+        while True:
+            try:
+                updates = updates_queue.get(timeout=UPDATES_RECEPTION_TIMEOUT)
+            except Empty:
+                # Stop if the process ended without marking the end
+                if process.exitcode is None:
+                    continue
+                logger.warning('The exploration process ended before sending '
+                               'all its updates.')
+                break
+            if updates is None:
+                break
+            for update_method_name, argument in updates:
+                getattr(self, update_method_name)(argument)
+
+    def _wait_for_updates(self):
+        """Wait for the updates to be received if the process has ended."""
+        if (self._updates_receiver is not None
+                and self._exploration_process.exitcode is not None):
+            self._updates_receiver.join()
+
+    def _send_update(self, update_method_name: str, argument: Any):
+        """Send an update to the main process when running asynchronously.
+
+        The update is added to the pending ones, which are sent by batches.
+
+        Args:
+            update_method_name: The name of the method that applies the update.
+            argument: The argument of the update method.
+        """
+        if self._updates_queue is None:
+            return
+        self._pending_updates.append((update_method_name, argument))
+        if (len(self._pending_updates) >= UPDATES_BATCH_SIZE
+                or perf_counter() - self._last_updates_sending
+                >= UPDATES_SENDING_INTERVAL):
+            self._send_pending_updates()
+
+    def _send_pending_updates(self):
+        """Send the pending updates to the main process as a batch."""
+        if self._updates_queue is None or not self._pending_updates:
+            return
+        self._updates_queue.put(self._pending_updates)
+        self._pending_updates = []
+        self._last_updates_sending = perf_counter()
+
+    def _asynchronous_execution(self, updates_queue: Queue):
+        """Run the exploration in another process.
+
+        Args:
+            updates_queue: The queue through which the updates are sent to the
+                           main process.
+        """
+        self._updates_queue = updates_queue
+        self._last_updates_sending = perf_counter()
+        try:
+            self._run_in_process()
+        finally:
+            # Send the last updates and mark the end of the exploration
+            self._send_pending_updates()
+            self._updates_queue.put(None)
+
+    def _run_in_process(self):
+        """Run the exploration in the process of an asynchronous run."""
         # Then, check that the sensitivity threshold is reachable
         if not self._is_sensitivity_threshold_reachable():
             logger.warning(
                 f'The sensivity threshold of {self._sensitivity_threshold} '
                 'is not reachable even using all the '
-                f'{len(self._dataset.candidate_attributes)} candidate '
+                f'{len(self._candidate_attributes)} candidate '
                 'attributes.')
             return
 
+        # Send the nodes evaluated by the reachability check before the
+        # search, as its first step can take long (e.g., a precomputation)
+        self._send_pending_updates()
+
         # If a solution exists, search for a solution
         logger.info('The sensitivity threshold is reachable, searching for'
                     ' a solution now...')
         self._search_for_solution()
 
         # A little message when the exploration is done
-        self._execution_time = datetime.now() - self._start_time
+        self._execution_time = get_elapsed_time(self._start_counter)
         logger.info(f'The exploration is done after {self._execution_time}.')
         logger.info(f'{len(self._explored_attr_sets)} attribute sets were '
                     'explored, among which '
@@ -190,18 +329,18 @@ class Exploration:
         """
         logger.info('Checking if the sensitivity threshold of '
                     f'{self._sensitivity_threshold} is reachable when using '
-                    f'the {len(self._dataset.candidate_attributes)} candidate '
+                    f'the {len(self._candidate_attributes)} candidate '
                     'attributes.')
 
         # The maximum cost when considering the complete set of attributes
-        self._max_cost, max_cost_explanation = self._usability_cost.evaluate(
-            self._dataset.candidate_attributes)
+        self._max_cost, max_cost_explanation = self._evaluate_usability_cost(
+            self._candidate_attributes)
         logger.debug(f'The maximum cost is {self._max_cost} which is '
                      f'explained as {max_cost_explanation}.')
 
         # Compute the sensitivity considering the complete set of attributes
-        sensitivity_canditate_attributes = self._sensitivity.evaluate(
-            self._dataset.candidate_attributes)
+        sensitivity_canditate_attributes = self._evaluate_sensitivity(
+            self._candidate_attributes)
         logger.debug('The minimum sensivity threshold is of '
                      f'{sensitivity_canditate_attributes}.')
 
@@ -211,16 +350,16 @@ class Exploration:
         if min_sensitivity_satisfies_threshold:
             candidate_attributes_state = State.SATISFYING
             self._add_satisfying_attribute_set(
-                self._dataset.candidate_attributes)
+                self._candidate_attributes)
         else:
             candidate_attributes_state = State.EXPLORED
 
         # Store this attribute set in the explored sets
-        compute_time = str(datetime.now() - self._start_time)
+        compute_time = str(get_elapsed_time(self._start_counter))
         self._add_explored_attribute_set({
             TraceData.TIME: compute_time,
             TraceData.ATTRIBUTES: (
-                self._dataset.candidate_attributes.attribute_ids),
+                self._candidate_attributes.attribute_ids),
             TraceData.SENSITIVITY: sensitivity_canditate_attributes,
             TraceData.USABILITY_COST: self._max_cost,
             TraceData.COST_EXPLANATION: max_cost_explanation,
@@ -230,9 +369,46 @@ class Exploration:
         # Return whether the minimum sensitivity satisfies the threshold
         return min_sensitivity_satisfies_threshold
 
+    def _evaluate_sensitivity(self, attribute_set: AttributeSet) -> float:
+        """Measure the sensitivity of an attribute set once.
+
+        Args:
+            attribute_set: The attribute set which sensitivity is to be
+                           measured.
+
+        Returns:
+            The sensitivity of the attribute set.
+        """
+        attribute_ids = tuple(attribute_set.attribute_ids)
+        sensitivity = self._sensitivities.get(attribute_ids)
+        if sensitivity is None:
+            sensitivity = self._sensitivity.evaluate(attribute_set)
+            self._sensitivities[attribute_ids] = sensitivity
+        return sensitivity
+
+    def _evaluate_usability_cost(self, attribute_set: AttributeSet
+                                 ) -> Tuple[float, Dict[str, float]]:
+        """Measure the usability cost of an attribute set once.
+
+        Args:
+            attribute_set: The attribute set which cost is to be measured.
+
+        Returns:
+            A pair with the cost and its explanation.
+        """
+        attribute_ids = tuple(attribute_set.attribute_ids)
+        usability_cost = self._usability_costs.get(attribute_ids)
+        if usability_cost is None:
+            usability_cost = self._usability_cost.evaluate(attribute_set)
+            self._usability_costs[attribute_ids] = usability_cost
+        return usability_cost
+
     def _default_parameters(self) -> Dict[str, Any]:
         """Give the parameters that are always present in an exploration.
 
+        A new dictionary is given at each call, so that the subclasses can add
+        their own parameters to it.
+
         Returns:
             A dictionary with the default parameters of an exploration.
         """
@@ -242,10 +418,7 @@ class Exploration:
             analysis_engine += f"[{modin_engine}]"
         return {
             ExplorationParameters.METHOD: self.__class__.__name__,
-            ExplorationParameters.SENSITIVITY_MEASURE: str(self._sensitivity),
-            ExplorationParameters.USABILITY_COST_MEASURE: str(
-                self._usability_cost),
-            ExplorationParameters.DATASET: str(self._dataset),
+            **self._component_descriptions,
             ExplorationParameters.SENSITIVITY_THRESHOLD: (
                 self._sensitivity_threshold),
             ExplorationParameters.ANALYSIS_ENGINE: analysis_engine,
@@ -275,6 +448,7 @@ class Exploration:
         """
         if not self._start_time:
             raise ExplorationNotRun('The exploration was not run.')
+        self._wait_for_updates()
 
         # If the run was launched, some attribute sets were explored but no
         # attribute sets satisfy the sensitivity threshold, this means that the
@@ -298,7 +472,7 @@ class Exploration:
                                              unreachable.
         """
         self._check_exploration_state()
-        # Create a new AttributeSet to exit the shared memory space
+        # Create a new AttributeSet so that the solution cannot be modified
         return AttributeSet(self._solution[0])
 
     def _update_solution(self, new_solution: AttributeSet):
@@ -310,7 +484,10 @@ class Exploration:
         Args:
             new_solution: The new solution found.
         """
+        # Store a copy as the caller can modify its attribute set afterwards
+        new_solution = AttributeSet(new_solution)
         self._solution[0] = new_solution
+        self._send_update('_update_solution', new_solution)
 
     def get_satisfying_attribute_sets(self) -> Set[AttributeSet]:
         """Provide the attribute sets that satisfy the sensitivity threshold.
@@ -327,8 +504,10 @@ class Exploration:
                                              unreachable.
         """
         self._check_exploration_state()
-        # Generate a set and exit the shared memory space
-        return set(self._satisfying_attribute_sets)
+        # Generate a set of new AttributeSet so that they cannot be modified
+        return {AttributeSet(satisfying_attribute_set)
+                for satisfying_attribute_set
+                in self._satisfying_attribute_sets}
 
     def _add_satisfying_attribute_set(self, new_attribute_set: AttributeSet):
         """Add a new attribute set that satisfies the sensitivity threshold.
@@ -337,7 +516,10 @@ class Exploration:
             new_attribute_set: The new attribute set that satisfies the
                                sensitivity threshold.
         """
+        # Store a copy as the caller can modify its attribute set afterwards
+        new_attribute_set = AttributeSet(new_attribute_set)
         self._satisfying_attribute_sets.append(new_attribute_set)
+        self._send_update('_add_satisfying_attribute_set', new_attribute_set)
 
     def get_explored_attribute_sets(self, start_id: Optional[int] = None,
                                     end_id: Optional[int] = None
@@ -356,13 +538,12 @@ class Exploration:
         """
         if not self._start_time:
             raise ExplorationNotRun('The exploration was not run.')
+        self._wait_for_updates()
 
-        # Create a new list to exit the shared memory space
-        if start_id is None:
-            start_id = 0
-        if end_id is None:
-            return list(self._explored_attr_sets[start_id:])
-        return list(self._explored_attr_sets[start_id:end_id])
+        # Copy the explored attribute sets, so that they can be modified
+        # without altering the trace
+        return [dict(explored_attr_set) for explored_attr_set
+                in self._explored_attr_sets[start_id:end_id]]
 
     def _add_explored_attribute_set(self, new_attribute_set: AttributeSet):
         """Add a new attribute set that was explored.
@@ -372,6 +553,7 @@ class Exploration:
                                sensitivity threshold.
         """
         self._explored_attr_sets.append(new_attribute_set)
+        self._send_update('_add_explored_attribute_set', new_attribute_set)
 
     def get_execution_time(self) -> Optional[timedelta]:
         """Provide the execution time of the exploration.
@@ -410,36 +592,37 @@ class Exploration:
         # Information about the parameters of the exploration
         json_output[TraceData.PARAMETERS] = self.parameters
 
-        # Information about the attributes
-        json_output[TraceData.ATTRIBUTES] = SortedDict()
-        for attribute in self._dataset.candidate_attributes:
-            json_output[TraceData.ATTRIBUTES][attribute.attribute_id] = (
-                attribute.name)
+        # Information about the attributes in the order of their id
+        json_output[TraceData.ATTRIBUTES] = self._candidate_id_to_name
 
         # The ids of the satisfying attributes
         satisfying_attributes_id = [
-            [attribute.attribute_id for attribute in satisfying_attr_set]
+            satisfying_attr_set.attribute_ids
             for satisfying_attr_set in self.get_satisfying_attribute_sets()]
 
         # Information about the results
         result = {
-            TraceData.SOLUTION: [attribute.attribute_id
-                                 for attribute in self.get_solution()],
+            TraceData.SOLUTION: self.get_solution().attribute_ids,
             TraceData.SATISFYING_ATTRIBUTES: satisfying_attributes_id,
             TraceData.START_TIME: str(self._start_time)
         }
         json_output[TraceData.RESULT] = result
 
-        # Information about the actual exploration
-        json_output[TraceData.EXPLORATION] = []
+        # Save the exploration data as a json file. The explored attribute
+        # sets are encoded one by one after the other information, as json.dump
+        # relies on a pure Python encoder whereas json.dumps uses the C encoder
+        # and we avoid holding the whole trace as a single string.
         explored_attribute_sets = self.get_explored_attribute_sets()
-        for i, explr_set_information in enumerate(explored_attribute_sets):
-            explr_set_information[TraceData.ATTRIBUTE_SET_ID] = i
-            json_output[TraceData.EXPLORATION].append(explr_set_information)
-
-        # Save the exploration data as a json file
         with open(save_path, 'w+') as save_file:
-            json.dump(json_output, save_file)
+            # The information about the actual exploration is the last entry
+            save_file.write(json.dumps(json_output)[:-1])
+            save_file.write(f', "{TraceData.EXPLORATION}": [')
+            for i, explr_set_information in enumerate(explored_attribute_sets):
+                explr_set_information[TraceData.ATTRIBUTE_SET_ID] = i
+                if i:
+                    save_file.write(', ')
+                save_file.write(json.dumps(explr_set_information))
+            save_file.write(']}')
 
         logger.info(f'The exploration is saved at {save_path}.')
 
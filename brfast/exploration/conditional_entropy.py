@@ -2,26 +2,34 @@
 """Module containing the exploration algorithm based on conditional entropy."""
 
 import importlib
-from datetime import datetime
 from math import ceil
 from multiprocessing import Pool
 from os import cpu_count
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
 
+import numpy as np
 from loguru import logger
 
 from brfast.config import params
 from brfast.data.attribute import Attribute, AttributeSet
 from brfast.data.dataset import FingerprintDataset
-from brfast.exploration import Exploration, State, TraceData
-from brfast.measures.distinguishability.entropy import attribute_set_entropy
+from brfast.exploration import (
+    Exploration, State, TraceData, get_elapsed_time)
+from brfast.measures.distinguishability.entropy import (
+    attribute_set_groups, attribute_value_codes, groups_entropy, refine_groups)
 pd = importlib.import_module(params.get('DataAnalysis', 'engine'))
 
+# The tolerance on the upper bound of the total entropy of an attribute, to
+# not skip it due to rounding errors
+ENTROPY_BOUND_TOLERANCE = 1e-9
 
-def _get_best_conditional_entropic_attribute(dataset: FingerprintDataset,
-                                             current_attributes: AttributeSet,
-                                             candidate_attributes: AttributeSet
-                                             ) -> Attribute:
+
+def _get_best_conditional_entropic_attribute(
+        dataset: FingerprintDataset, current_attributes: AttributeSet,
+        candidate_attributes: AttributeSet,
+        current_groups: Optional[np.ndarray] = None,
+        candidate_value_codes: Optional[np.ndarray] = None,
+        candidate_entropies: Optional[Sequence[float]] = None) -> Attribute:
     """Get the attribute that provides the highest total entropy.
 
     When several attributes provide the same total entropy, the attribute of
@@ -32,6 +40,15 @@ def _get_best_conditional_entropic_attribute(dataset: FingerprintDataset,
         dataset: The dataset used to compute the conditional entropy.
         current_attributes: The attributes that compose the current solution.
         candidate_attributes: The candidate attributes (i.e., those available).
+        current_groups: The groups of the browsers considering the current
+                        attributes (see attribute_set_groups), computed if
+                        not given.
+        candidate_value_codes: The value codes of the candidate attributes
+                               in their order (see attribute_value_codes),
+                               computed if not given.
+        candidate_entropies: The entropy of each candidate attribute in their
+                             order, used to skip the attributes that cannot
+                             provide a higher total entropy.
 
     Raises:
         ValueError: There are candidate attributes and the fingerprint dataset
@@ -62,7 +79,8 @@ def _get_best_conditional_entropic_attribute(dataset: FingerprintDataset,
     if not params.getboolean('Multiprocessing', 'explorations'):
         logger.debug('Measuring the attributes entropy on a single process...')
         best_attribute, best_total_ent = _best_conditional_entropic_attribute(
-            df_one_fp_per_browser, current_attributes, candidate_attributes)
+            df_one_fp_per_browser, current_attributes, candidate_attributes,
+            current_groups, candidate_value_codes, candidate_entropies)
         logger.debug(f'  The best attribute is {best_attribute} for a total '
                      f'entropy of {best_total_ent}.')
         return best_attribute
@@ -94,6 +112,15 @@ def _get_best_conditional_entropic_attribute(dataset: FingerprintDataset,
         if best_attribute:  # To avoid the empty results which are None
             best_attribute_informations[best_attribute] = best_total_entropy
 
+    # The groups of the current attributes and the value codes of the
+    # candidate attributes are computed once for the processes
+    if current_groups is None and candidate_attributes:
+        current_groups = attribute_set_groups(df_one_fp_per_browser,
+                                              current_attributes)
+    if candidate_value_codes is None:
+        candidate_value_codes = attribute_value_codes(df_one_fp_per_browser,
+                                                      candidate_attributes)
+
     # Spawn a number of processes equal to the number of cores
     candidate_attributes_list = list(candidate_attributes)
     async_results = []
@@ -104,11 +131,15 @@ def _get_best_conditional_entropic_attribute(dataset: FingerprintDataset,
             end_id = (process_id + 1) * attributes_per_core
             candidate_attributes_subset = AttributeSet(
                 candidate_attributes_list[start_id:end_id])
+            value_codes_subset = candidate_value_codes[:, start_id:end_id]
+            entropies_subset = (None if candidate_entropies is None
+                                else candidate_entropies[start_id:end_id])
 
             async_result = pool.apply_async(
                 _best_conditional_entropic_attribute,
                 args=(df_one_fp_per_browser, current_attributes,
-                      candidate_attributes_subset),
+                      candidate_attributes_subset, current_groups,
+                      value_codes_subset, entropies_subset),
                 callback=update_best_conditional_entropy_attribute)
             async_results.append(async_result)
 
@@ -132,10 +163,13 @@ def _get_best_conditional_entropic_attribute(dataset: FingerprintDataset,
     return best_attribute
 
 
-def _best_conditional_entropic_attribute(df_one_fp_per_browser: pd.DataFrame,
-                                         current_attributes: AttributeSet,
-                                         candidate_attributes: AttributeSet
-                                         ) -> Tuple[Attribute, float]:
+def _best_conditional_entropic_attribute(
+        df_one_fp_per_browser: pd.DataFrame, current_attributes: AttributeSet,
+        candidate_attributes: AttributeSet,
+        current_groups: Optional[np.ndarray] = None,
+        candidate_value_codes: Optional[np.ndarray] = None,
+        candidate_entropies: Optional[Sequence[float]] = None
+        ) -> Tuple[Attribute, float]:
     """Get the best conditional entropic attribute among the candidates.
 
     Args:
@@ -144,27 +178,71 @@ def _best_conditional_entropic_attribute(df_one_fp_per_browser: pd.DataFrame,
         current_attributes: The attributes that compose the current solution.
         candidate_attributes: The candidate attributes for this process to
                               check.
+        current_groups: The groups of the browsers considering the current
+                        attributes (see attribute_set_groups), computed if
+                        not given.
+        candidate_value_codes: The value codes of the candidate attributes
+                               in their order (see attribute_value_codes),
+                               computed for each attribute if not given.
+        candidate_entropies: The entropy of each candidate attribute in their
+                             order, used to skip the attributes that cannot
+                             provide a higher total entropy.
 
     Returns:
         A tuple with the best attribute for this process and the total entropy
-        when adding this attribute to the current attributes.
+        when adding this attribute to the current attributes. If several
+        attributes provide the same total entropy, the attribute of the lowest
+        id is given.
     """
+    candidate_attributes_list = list(candidate_attributes)
+    positions = range(len(candidate_attributes_list))
+
+    # The total entropy when adding an attribute is at most the entropy of the
+    # current attributes plus the entropy of the attribute. If the entropy of
+    # the attributes is known, they are checked in the decreasing order of
+    # this upper bound, and we stop when it is below the best total entropy.
+    current_entropy = None
+    if candidate_entropies is not None:
+        positions = sorted(positions, key=candidate_entropies.__getitem__,
+                           reverse=True)
+
     best_local_attribute, best_local_total_entropy = None, -float('inf')
-    for attribute in candidate_attributes:
+    for position in positions:
+        attribute = candidate_attributes_list[position]
 
         # Ignore the attributes that are already in the current attribute set
         if attribute in current_attributes:
             continue
 
-        # Generate a new attribute set with this attribute
-        attribute_set = AttributeSet(current_attributes)
-        attribute_set.add(attribute)
-
-        # Evaluate the conditional entropy of this new attribute set and save
-        # it in the dictionary
-        attr_set_entropy = attribute_set_entropy(df_one_fp_per_browser,
-                                                 attribute_set)
-        if attr_set_entropy > best_local_total_entropy:
+        # The groups of the current attributes are computed once, and refined
+        # by the value codes of each candidate attribute
+        if current_groups is None:
+            current_groups = attribute_set_groups(df_one_fp_per_browser,
+                                                  current_attributes)
+
+        # Stop if this attribute and the next ones cannot provide a higher
+        # total entropy
+        if candidate_entropies is not None:
+            if current_entropy is None:
+                current_entropy = groups_entropy(current_groups)
+            upper_bound = current_entropy + candidate_entropies[position]
+            if (upper_bound + ENTROPY_BOUND_TOLERANCE
+                    < best_local_total_entropy):
+                break
+
+        if candidate_value_codes is None:
+            value_codes = attribute_value_codes(df_one_fp_per_browser,
+                                                (attribute,))[:, 0]
+        else:
+            value_codes = candidate_value_codes[:, position]
+
+        # Evaluate the total entropy when adding this attribute to the current
+        # attributes
+        attr_set_entropy = groups_entropy(
+            refine_groups(current_groups, value_codes))
+        if (attr_set_entropy > best_local_total_entropy
+                or (attr_set_entropy == best_local_total_entropy
+                    and attribute < best_local_attribute)):
             best_local_attribute = attribute
             best_local_total_entropy = attr_set_entropy
 
@@ -202,14 +280,30 @@ class ConditionalEntropy(Exploration):
         # as it is equivalent to no browser fingerprinting used at all)
         temp_solution, sensitivity = AttributeSet(), 1.0
 
+        # The groups of the browsers considering the temporary solution, which
+        # are refined by each attribute that is added to it. The values of the
+        # candidate attributes are encoded once for the whole exploration.
+        df_one_fp_per_browser = self._dataset.get_df_w_one_fp_per_browser()
+        candidate_value_codes = attribute_value_codes(
+            df_one_fp_per_browser, self._candidate_attributes)
+        candidate_positions = {
+            attribute: position for position, attribute
+            in enumerate(self._candidate_attributes)}
+        candidate_entropies = [
+            groups_entropy(candidate_value_codes[:, position])
+            for position in range(len(candidate_positions))]
+        temp_solution_groups = np.zeros(len(df_one_fp_per_browser),
+                                        dtype=np.int64)
+
         # We already checked that the sensitivity threshold is reachable, hence
         # we always reach it when processing the Exploration
         while sensitivity > self._sensitivity_threshold:
 
             # Find the attribute that has the highest conditional entropy
             best_cond_ent_attr = _get_best_conditional_entropic_attribute(
-                self._dataset, temp_solution,
-                self._dataset.candidate_attributes)
+                self._dataset, temp_solution, self._candidate_attributes,
+                temp_solution_groups, candidate_value_codes,
+                candidate_entropies)
 
             # NOTE Removed as we already check that a solution exists before
             #      running the exploration. As a result, we always reach an
@@ -221,14 +315,18 @@ class ConditionalEntropy(Exploration):
 
             # Add this attribute to the temporary solution
             temp_solution.add(best_cond_ent_attr)
+            temp_solution_groups = refine_groups(
+                temp_solution_groups,
+                candidate_value_codes[:, candidate_positions[
+                    best_cond_ent_attr]])
 
             # Compute its sensitivity and its cost
-            logger.debug(f'Exploring {temp_solution}...')
-            sensitivity = self._sensitivity.evaluate(temp_solution)
+            logger.debug('Exploring {}...', temp_solution)
+            sensitivity = self._evaluate_sensitivity(temp_solution)
             cost, cost_explanation = (
-                self._usability_cost.evaluate(temp_solution))
-            logger.debug(f'  Sensitivity ({sensitivity}), '
-                         f'usability cost ({cost})')
+                self._evaluate_usability_cost(temp_solution))
+            logger.debug('  Sensitivity ({}), usability cost ({})',
+                         sensitivity, cost)
 
             # If it satisfies the sensitivity threshold, quit the loop
             if sensitivity <= self._sensitivity_threshold:
@@ -239,7 +337,7 @@ class ConditionalEntropy(Exploration):
                 attribute_set_state = State.EXPLORED
 
             # Store this attribute set in the explored sets
-            compute_time = str(datetime.now() - self._start_time)
+            compute_time = str(get_elapsed_time(self._start_counter))
             self._add_explored_attribute_set({
                 TraceData.TIME: compute_time,
                 TraceData.ATTRIBUTES: temp_solution.attribute_ids,
@@ -248,3 +346,6 @@ class ConditionalEntropy(Exploration):
                 TraceData.COST_EXPLANATION: cost_explanation,
                 TraceData.STATE: attribute_set_state
             })
+
+            # Send the explored attribute set before the next step
+            self._send_pending_updates()
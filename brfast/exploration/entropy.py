@@ -2,7 +2,6 @@
 """Module containing the entropy-based exploration algorithm."""
 
 import importlib
-from datetime import datetime
 from math import ceil
 from multiprocessing import Pool
 from os import cpu_count
@@ -10,7 +9,8 @@ from typing import Dict
 
 from loguru import logger
 
-from brfast.exploration import Exploration, State, TraceData
+from brfast.exploration import (
+    Exploration, State, TraceData, get_elapsed_time)
 from brfast.config import params
 from brfast.data.attribute import Attribute, AttributeSet
 from brfast.data.dataset import FingerprintDataset
@@ -49,8 +49,8 @@ class Entropy(Exploration):
         # Get a dictionary of the entropy of each attribute
         logger.info('Computing the entropy of each attribute...')
         attributes_entropy = _get_attributes_entropy(
-            self._dataset, self._dataset.candidate_attributes)
-        entropy_compute_time = datetime.now() - self._start_time
+            self._dataset, self._candidate_attributes)
+        entropy_compute_time = get_elapsed_time(self._start_counter)
         logger.info('Entropy of the attributes computed after '
                     f'{entropy_compute_time}.')
 
@@ -61,14 +61,14 @@ class Entropy(Exploration):
 
             # Check the new attribute set that is obtained
             attribute_set.add(attribute)
-            logger.debug(f'Exploring {attribute_set}...')
+            logger.debug('Exploring {}...', attribute_set)
 
             # Compute its sensitivity and its cost
-            sensitivity = self._sensitivity.evaluate(attribute_set)
+            sensitivity = self._evaluate_sensitivity(attribute_set)
             cost, cost_explanation = (
-                self._usability_cost.evaluate(attribute_set))
-            logger.debug(f'  Sensitivity ({sensitivity}), '
-                         f'usability cost ({cost})')
+                self._evaluate_usability_cost(attribute_set))
+            logger.debug('  Sensitivity ({}), usability cost ({})',
+                         sensitivity, cost)
 
             # If it satisfies the sensitivity threshold, quit the loop
             if sensitivity <= self._sensitivity_threshold:
@@ -76,7 +76,7 @@ class Entropy(Exploration):
                 self._add_satisfying_attribute_set(attribute_set)
 
                 # Store this attribute set in the explored sets
-                compute_time = str(datetime.now() - self._start_time)
+                compute_time = str(get_elapsed_time(self._start_counter))
                 self._add_explored_attribute_set({
                     TraceData.TIME: compute_time,
                     TraceData.ATTRIBUTES: attribute_set.attribute_ids,
@@ -90,7 +90,7 @@ class Entropy(Exploration):
                 break
 
             # If it does not satisfy the sensitivity threshold, we continue
-            compute_time = str(datetime.now() - self._start_time)
+            compute_time = str(get_elapsed_time(self._start_counter))
             self._add_explored_attribute_set({
                 TraceData.TIME: compute_time,
                 TraceData.ATTRIBUTES: attribute_set.attribute_ids,
@@ -100,6 +100,9 @@ class Entropy(Exploration):
                 TraceData.STATE: State.EXPLORED
             })
 
+            # Send the explored attribute set before the next step
+            self._send_pending_updates()
+
 
 def _get_attributes_entropy(dataset: FingerprintDataset,
                             attributes: AttributeSet
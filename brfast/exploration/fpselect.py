@@ -1,12 +1,10 @@
 #!/usr/bin/python3
 """Module containing the FPSelect exploration algorithm."""
 
-from datetime import datetime
 from math import ceil
 from multiprocessing import Pool
-from multiprocessing.managers import ListProxy
 from os import cpu_count
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
@@ -14,7 +12,7 @@ from brfast.config import params
 from brfast.data.attribute import AttributeSet
 from brfast.data.dataset import FingerprintDataset
 from brfast.exploration import (Exploration, ExplorationParameters, State,
-                                TraceData)
+                                TraceData, get_elapsed_time)
 from brfast.measures import SensitivityMeasure, UsabilityCostMeasure
 
 
@@ -108,16 +106,17 @@ class FPSelect(Exploration):
         while self._attribute_sets_to_expand:
             logger.debug('---------------------------------------------------')
             logger.debug(f'Starting the stage {stage}.')
-            logger.debug(f'The {len(self._attribute_sets_to_expand)} attribute'
-                         f' sets to expand: {self._attribute_sets_to_expand}.')
-            logger.debug(f'The {len(self._attribute_sets_ignored_supersets)} '
-                         'attribute sets which supersets are ignored: '
-                         f'{self._attribute_sets_ignored_supersets}.')
+            logger.debug('The {} attribute sets to expand: {}.',
+                         len(self._attribute_sets_to_expand),
+                         self._attribute_sets_to_expand)
+            logger.debug('The {} attribute sets which supersets are ignored: '
+                         '{}.', len(self._attribute_sets_ignored_supersets),
+                         self._attribute_sets_ignored_supersets)
 
             # Generate the attribute sets to explore by expanding the set S
             sets_to_explore = self._expand_s()
-            logger.debug(f'The {len(sets_to_explore)} attribute sets to '
-                         f'explore: {sets_to_explore}.')
+            logger.debug('The {} attribute sets to explore: {}.',
+                         len(sets_to_explore), sets_to_explore)
 
             # Explore the level and retrieve the next attribute sets to expand
             # sorted by their efficiency (the most efficient are firsts)
@@ -155,25 +154,42 @@ class FPSelect(Exploration):
         # next attribute sets to explore that will be sorted at the end
         attribute_sets_efficiency = {}
 
-        def update_after_exploration(result: Tuple[Dict[AttributeSet, float],
-                                                   Set[AttributeSet],
-                                                   Set[AttributeSet]]):
+        def update_after_exploration(
+                result: Tuple[Dict[AttributeSet, float], Set[AttributeSet],
+                              Set[AttributeSet],
+                              Optional[Tuple[AttributeSet, float]],
+                              List[Dict[str, Any]]]):
             """Update the informations after exploring a level.
 
             Args:
-                result: A triplet with
+                result: A tuple with
                     - The attribute sets that could be explored afterwards and
                        their efficiency.
                     - The attribute sets that satisfy the threshold.
                     - The attribute sets which supersets are to be ignored.
+                    - The best solution found with its cost, or None.
+                    - The trace of the explored attribute sets.
 
             Note: This is executed by the main thread and does not pose any
                   concurrency or synchronization problem.
             """
-            attr_sets_eff, satisf_attr_sets, attr_sets_ign_sups = result
+            (attr_sets_eff, satisf_attr_sets, attr_sets_ign_sups, solution,
+             explored_attr_sets) = result
             attribute_sets_efficiency.update(attr_sets_eff)
             self._attribute_sets_ignored_supersets.update(attr_sets_ign_sups)
-            self._satisfying_attribute_sets.extend(satisf_attr_sets)
+            for satisfying_attr_set in satisf_attr_sets:
+                self._add_satisfying_attribute_set(satisfying_attr_set)
+            for explored_attr_set in explored_attr_sets:
+                self._add_explored_attribute_set(explored_attr_set)
+
+            # Update the solution if a lower cost is found
+            if solution and solution[1] < self._solution[1]:
+                self._update_solution(solution[0])
+                self._solution[1] = solution[1]
+
+            # Send the results of these attribute sets at once when running
+            # asynchronously
+            self._send_pending_updates()
 
         # If we execute on a single process
         if not params.getboolean('Multiprocessing', 'explorations'):
@@ -183,8 +199,8 @@ class FPSelect(Exploration):
                 _explore_attribute_sets(
                     attribute_sets_to_explore, self._sensitivity,
                     self._usability_cost, self._sensitivity_threshold,
-                    self._max_cost, self._solution, self._explored_attr_sets,
-                    self._start_time, self._pruning))
+                    self._max_cost, self._solution[1], self._start_counter,
+                    self._pruning))
             return attribute_sets_efficiency
 
         # Infer the number of cores to use
@@ -196,7 +212,10 @@ class FPSelect(Exploration):
                      f' to explore over {nb_cores}(+{free_cores}) cores, hence'
                      f' {attribute_sets_per_core} attribute sets per core.')
 
-        # Spawn a number of processes equal to the number of cores
+        # Spawn a number of processes equal to the number of cores. They all
+        # start from the minimum cost currently found, and their results are
+        # merged afterwards.
+        current_min_cost = self._solution[1]
         attribute_sets_to_explore_list = list(attribute_sets_to_explore)
         async_results = []
         with Pool(processes=nb_cores) as pool:
@@ -212,9 +231,8 @@ class FPSelect(Exploration):
                     _explore_attribute_sets,
                     args=(subset_attr_sets_to_explore, self._sensitivity,
                           self._usability_cost, self._sensitivity_threshold,
-                          self._max_cost, self._solution,
-                          self._explored_attr_sets, self._start_time,
-                          self._pruning),
+                          self._max_cost, current_min_cost,
+                          self._start_counter, self._pruning),
                     callback=update_after_exploration)
                 async_results.append(async_result)
 
@@ -251,7 +269,7 @@ class FPSelect(Exploration):
                          'single process...')
             return _expand_attribute_sets(
                 self._attribute_sets_to_expand,
-                self._dataset.candidate_attributes,
+                self._candidate_attributes,
                 self.get_satisfying_attribute_sets(),
                 self._attribute_sets_ignored_supersets, self._pruning)
 
@@ -291,7 +309,7 @@ class FPSelect(Exploration):
                 async_result = pool.apply_async(
                     _expand_attribute_sets,
                     args=(process_attr_sets_to_expand,
-                          self._dataset.candidate_attributes,
+                          self._candidate_attributes,
                           satisfying_attribute_sets,
                           self._attribute_sets_ignored_supersets,
                           self._pruning),
@@ -310,12 +328,12 @@ def _explore_attribute_sets(attribute_sets_to_explore: List[AttributeSet],
                             sensitivity_measure: SensitivityMeasure,
                             usability_cost_measure: UsabilityCostMeasure,
                             sensitivity_threshold: float, max_cost: float,
-                            solution_storage: ListProxy,
-                            explored_attribute_sets: ListProxy,
-                            start_time: datetime, use_pruning_methods: bool
+                            min_cost: float, start_counter: float,
+                            use_pruning_methods: bool
                             ) -> Tuple[Dict[AttributeSet, float],
-                                       Set[AttributeSet],
-                                       Set[AttributeSet]]:
+                                       Set[AttributeSet], Set[AttributeSet],
+                                       Optional[Tuple[AttributeSet, float]],
+                                       List[Dict[str, Any]]]:
     """Explore the attribute sets of a given level.
 
     Args:
@@ -325,39 +343,40 @@ def _explore_attribute_sets(attribute_sets_to_explore: List[AttributeSet],
         usability_cost_measure: The usability cost measure to use.
         sensitivity_threshold: The sensitivity threshold.
         max_cost: The maximum cost when using all the candidate attributes.
-        solution_storage: The storage of the solution as a list. The first
-                          element is the best attribute set and the second is
-                          the current minimum cost.
-        explored_attribute_sets: The storage of the explored attribute sets.
-        start_time: The start time of the exploration.
+        min_cost: The minimum cost currently found.
+        start_counter: The value of the performance counter at the start of
+                       the exploration.
         use_pruning_methods: Whether we use pruning methods or not.
 
     Returns:
-        A triplet with
+        A tuple with
         - The attribute sets that could be explored afterwards and their
           efficiency.
         - The attribute sets that satisfy the sensitivity threshold.
         - The attribute sets which supersets are to be ignored.
+        - The solution found with its cost if it is below the minimum cost,
+          None otherwise.
+        - The trace of the explored attribute sets.
     """
     process_attribute_sets_efficiency = {}
     process_satisfying_attribute_sets = set()
     process_attribute_sets_ignored_supersets = set()
+    process_solution = None
+    explored_attribute_sets = []
 
     for attribute_set in attribute_sets_to_explore:
-        logger.debug(f'Exploring {attribute_set}:')
+        logger.debug('Exploring {}:', attribute_set)
         attribute_set_state = State.EXPLORED
 
         # Compute its sensitivity and its cost
         sensitivity = sensitivity_measure.evaluate(attribute_set)
         cost, cost_explanation = usability_cost_measure.evaluate(attribute_set)
-        logger.debug(f'  sensitivity={sensitivity} / usability cost={cost}')
-
-        # Get the current minimum cost. Note that it can be updated afterwards,
-        # but it does not change the overall result. The only effect is that
-        # few additional attribute sets can be put in the
-        # process_attribute_sets_efficiency storage.
-        current_min_cost = solution_storage[1]
+        logger.debug('  sensitivity={} / usability cost={}', sensitivity, cost)
 
+        # The minimum cost is the one found by this process. Note that the
+        # other processes can find a lower cost, but it does not change the
+        # overall result. The only effect is that few additional attribute
+        # sets can be put in the process_attribute_sets_efficiency storage.
         # If the sensitivity threshold is reached  (s(C) <= alpha)
         if sensitivity <= sensitivity_threshold:
             process_satisfying_attribute_sets.add(attribute_set)
@@ -365,18 +384,18 @@ def _explore_attribute_sets(attribute_sets_to_explore: List[AttributeSet],
             attribute_set_state = State.SATISFYING
 
             # If a minimum cost is found  (c(C) < c_min)
-            if cost < current_min_cost:
-                solution_storage[1] = cost
-                solution_storage[0] = attribute_set
-                logger.debug(f'  new solution found: {attribute_set}')
+            if cost < min_cost:
+                min_cost = cost
+                process_solution = (attribute_set, cost)
+                logger.debug('  new solution found: {}', attribute_set)
             else:
-                logger.debug('  new satisfying attribute set: '
-                             f'{attribute_set}')
+                logger.debug('  new satisfying attribute set: {}',
+                             attribute_set)
 
         # If the sensitivity threshold is not reached but the cost is
         # still below the minimum currently found
         # (s(C) > alpha) && (c(C) < c_min)
-        elif cost < current_min_cost:
+        elif cost < min_cost:
             # Compute the efficiency of this attribute set
             cost_gain = max_cost - cost
             efficiency = cost_gain / sensitivity
@@ -384,17 +403,17 @@ def _explore_attribute_sets(attribute_sets_to_explore: List[AttributeSet],
 
             # Add this attribute sets to those to explore
             process_attribute_sets_efficiency[attribute_set] = efficiency
-            logger.debug(f'  will explore the supersets of {attribute_set}.')
+            logger.debug('  will explore the supersets of {}.', attribute_set)
 
         # For any other cases (threshold not reached, higher cost) when
         # the pruning methods are used, we ignore their supersets
         elif use_pruning_methods:
             process_attribute_sets_ignored_supersets.add(attribute_set)
             attribute_set_state = State.PRUNED
-            logger.debug(f'  will ignore the supersets of {attribute_set}.')
+            logger.debug('  will ignore the supersets of {}.', attribute_set)
 
         # Store this attribute set in the explored sets
-        compute_time = str(datetime.now() - start_time)
+        compute_time = str(get_elapsed_time(start_counter))
         explored_attribute_sets.append({
             TraceData.TIME: compute_time,
             TraceData.ATTRIBUTES: attribute_set.attribute_ids,
@@ -406,7 +425,8 @@ def _explore_attribute_sets(attribute_sets_to_explore: List[AttributeSet],
 
     return (process_attribute_sets_efficiency,
             process_satisfying_attribute_sets,
-            process_attribute_sets_ignored_supersets)
+            process_attribute_sets_ignored_supersets, process_solution,
+            explored_attribute_sets)
 
 
 def _expand_attribute_sets(attr_sets_to_expand: List[AttributeSet],
@@ -428,45 +448,88 @@ def _expand_attribute_sets(attr_sets_to_expand: List[AttributeSet],
     Returns:
         The set of the next attribute sets to explore.
     """
+    # The attribute sets are compared as bitmasks, with a bit for each
+    # candidate attribute
+    attribute_bits = _get_attribute_bits(candidate_attributes)
+    satisfying_masks = [
+        _get_attribute_set_mask(attr_set_sat, attribute_bits)
+        for attr_set_sat in satisfying_attribute_sets]
+    if use_pruning_methods:
+        satisfying_masks.extend(
+            _get_attribute_set_mask(attr_set_to_ign, attribute_bits)
+            for attr_set_to_ign in attribute_sets_ignored_supersets)
+
+    # The masks of the attribute sets that were already considered
+    considered_masks = set()
     next_attr_sets_to_explore = set()
 
     # Generate the attr. sets composed of S_i with one more attr.
     # For all S_i in S
     for set_to_expand in attr_sets_to_expand:
+        set_to_expand_mask = _get_attribute_set_mask(set_to_expand,
+                                                     attribute_bits)
+
         # For all a in A diff C
         for attribute in candidate_attributes:
-            if attribute in set_to_expand:
+            attribute_bit = attribute_bits[attribute.attribute_id]
+            if set_to_expand_mask & attribute_bit:
                 continue
 
             # The attr. set C with one more attribute (S_i union {a})
+            new_attr_set_mask = set_to_expand_mask | attribute_bit
+            if new_attr_set_mask in considered_masks:
+                continue
+            considered_masks.add(new_attr_set_mask)
+
+            # Ignore C if it is a superset of an attr. set of T, or if we use
+            # the pruning methods and it is a superset of an attr. set which
+            # supersets are to be ignored
+            if any(new_attr_set_mask & mask == mask
+                   for mask in satisfying_masks):
+                continue
+
+            # If C is fine, it is added to the attr. sets to explore
             new_attr_set = AttributeSet(set_to_expand)
             new_attr_set.add(attribute)
-            add_new_attr_set = True
+            next_attr_sets_to_explore.add(new_attr_set)
 
-            # Ignore C if the attr. a is already in the attr. set S_i
-            if attribute in set_to_expand:
-                add_new_attr_set = False
-                continue
+    return next_attr_sets_to_explore
 
-            # Ignore C if it is a superset of an attr. set of T
-            for attr_set_sat in satisfying_attribute_sets:
-                if new_attr_set.issuperset(attr_set_sat):
-                    add_new_attr_set = False
-                    break
 
-            # Ignore C if we use the pruning methods and it is a superset
-            # of an attr. set which supersets are to be ignored
-            if use_pruning_methods and add_new_attr_set:
-                for attr_set_to_ign in attribute_sets_ignored_supersets:
-                    if new_attr_set.issuperset(attr_set_to_ign):
-                        add_new_attr_set = False
-                        break
+def _get_attribute_bits(candidate_attributes: AttributeSet) -> Dict[int, int]:
+    """Give the bit of each candidate attribute in the attribute set masks.
 
-            # If C is fine, it is added to the attr. sets to explore
-            if add_new_attr_set:
-                next_attr_sets_to_explore.add(new_attr_set)
+    Args:
+        candidate_attributes: The complete set of the candidate attributes.
 
-    return next_attr_sets_to_explore
+    Returns:
+        A dictionary mapping the id of each candidate attribute to its bit.
+    """
+    return {attribute_id: 1 << position
+            for position, attribute_id in enumerate(
+                candidate_attributes.attribute_ids)}
+
+
+def _get_attribute_set_mask(attribute_set: AttributeSet,
+                            attribute_bits: Dict[int, int]) -> int:
+    """Give the bitmask of an attribute set.
+
+    An attribute set is a subset of another one if the bitwise and of their
+    masks is the mask of the subset.
+
+    Args:
+        attribute_set: The attribute set, which attributes are candidate
+                       attributes.
+        attribute_bits: The bit of each candidate attribute by its id.
+
+    Returns:
+        The bitmask of the attribute set, that is the bitwise or of the bits of
+        its attributes.
+    """
+    mask = 0
+    for attribute_id in attribute_set.attribute_ids:
+        mask |= attribute_bits[attribute_id]
+    return mask
 
 
 # ============================== Utility Classes ==============================
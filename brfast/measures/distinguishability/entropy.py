@@ -3,13 +3,15 @@
 
 import importlib
 from math import log2
-from typing import Any, List
+from typing import Any, Iterable, List, Optional
 
+import numpy as np
+import pandas
 from loguru import logger
 from scipy.stats import entropy
 
 from brfast.config import ANALYSIS_ENGINES, params
-from brfast.data.attribute import AttributeSet
+from brfast.data.attribute import Attribute, AttributeSet
 from brfast.data.dataset import FingerprintDataset
 from brfast.measures import Analysis
 pd = importlib.import_module(params.get('DataAnalysis', 'engine'))
@@ -56,7 +58,7 @@ def attribute_set_entropy(df_one_fp_per_browser: pd.DataFrame,
         df_one_fp_per_browser = df_one_fp_per_browser._to_pandas()
 
     # Project the datafame on the wanted attributes
-    attribute_names = [attribute.name for attribute in attribute_set]
+    attribute_names = attribute_set.attribute_names
     projected_dataframe = df_one_fp_per_browser[attribute_names]
 
     # 1. Convert the values of the attributes as strings for the
@@ -74,6 +76,132 @@ def attribute_set_entropy(df_one_fp_per_browser: pd.DataFrame,
     return entropy(distinct_value_count, base=ENTROPY_BASE)
 
 
+def attribute_value_codes(df_one_fp_per_browser: pd.DataFrame,
+                          attributes: Iterable[Attribute]) -> np.ndarray:
+    """Give the values of the attributes encoded as integer codes.
+
+    As for attribute_set_entropy, the values are compared as strings for the
+    NaN values to not be ignored. The codes of an attribute are numbered from
+    0, in the order of appearance of the values. The codes of the categorical
+    columns are directly used, the missing values having their own code,
+    instead of converting their values to strings.
+
+    Args:
+        df_one_fp_per_browser: The dataframe with only one fingerprint per
+                               browser.
+        attributes: The attributes to encode.
+
+    Returns:
+        A two-dimensional array of int32 with a row for each browser and a
+        column for each attribute, in the order of the attributes.
+
+    Raises:
+        KeyError: An attribute is not in the fingerprint dataset.
+
+    Note:
+        This function is forced to use pandas as the data analysis engine.
+    """
+    # If using modin, switch back to pandas
+    if params.get('DataAnalysis', 'engine') == ANALYSIS_ENGINES[1]:
+        logger.warning('The attribute_value_codes function badly supports the '
+                       'modin engine. We switch back to pandas in this '
+                       'function.')
+        df_one_fp_per_browser = df_one_fp_per_browser._to_pandas()
+
+    attributes = tuple(attributes)
+    value_codes = np.empty((len(df_one_fp_per_browser), len(attributes)),
+                           dtype=np.int32)
+    for position, attribute in enumerate(attributes):
+        column = df_one_fp_per_browser[attribute.name]
+        if isinstance(column.dtype, pandas.CategoricalDtype):
+            # The missing values (code -1) get the code after the categories
+            category_codes = column.cat.codes.to_numpy()
+            value_codes[:, position] = np.where(
+                category_codes < 0, len(column.cat.categories),
+                category_codes)
+        else:
+            value_codes[:, position] = pandas.factorize(
+                column.astype('str'))[0]
+    return value_codes
+
+
+def refine_groups(groups: np.ndarray, value_codes: np.ndarray) -> np.ndarray:
+    """Split the groups of browsers according to the values of an attribute.
+
+    Args:
+        groups: The group of each browser, the groups being numbered from 0.
+        value_codes: The value code of each browser for the attribute (see
+                     attribute_value_codes).
+
+    Returns:
+        The group of each browser considering the attribute in addition, the
+        groups being numbered from 0.
+    """
+    # The browsers of a group are split according to their value, by
+    # numbering the pairs of (group, value code)
+    distinct_values = int(value_codes.max()) + 1 if len(value_codes) else 0
+    if distinct_values < 2:
+        return groups
+    return pandas.factorize(groups * distinct_values + value_codes)[0]
+
+
+def attribute_set_groups(df_one_fp_per_browser: pd.DataFrame,
+                         attributes: Iterable[Attribute],
+                         parent_groups: Optional[np.ndarray] = None
+                         ) -> np.ndarray:
+    """Give the group of each browser considering the given attributes.
+
+    The browsers that share the same fingerprint considering the attributes
+    are in the same group. As for attribute_set_entropy, the values are
+    compared as strings for the NaN values to not be ignored. The groups of
+    the browsers considering an attribute set can be refined by additional
+    attributes, without processing the attributes of the set again.
+
+    Args:
+        df_one_fp_per_browser: The dataframe with only one fingerprint per
+                               browser.
+        attributes: The attributes to consider.
+        parent_groups: The groups of the browsers considering other
+                       attributes, which are refined by the given attributes.
+                       By default, all the browsers are in the same group.
+
+    Returns:
+        An array of the group of each browser (in the order of the rows of the
+        dataframe), the groups being numbered from 0.
+
+    Raises:
+        ValueError: The fingerprint dataset is empty.
+        KeyError: An attribute is not in the fingerprint dataset.
+    """
+    # If an empty dataset, we cannot group the browsers
+    if df_one_fp_per_browser.empty:
+        raise ValueError('Cannot group the browsers of an empty dataset.')
+
+    groups = parent_groups
+    if groups is None:
+        groups = np.zeros(len(df_one_fp_per_browser), dtype=np.int64)
+
+    value_codes = attribute_value_codes(df_one_fp_per_browser, attributes)
+    for position in range(value_codes.shape[1]):
+        groups = refine_groups(groups, value_codes[:, position])
+    return groups
+
+
+def groups_entropy(groups: np.ndarray) -> float:
+    """Compute the entropy of the fingerprints given the group of the browsers.
+
+    Args:
+        groups: The group of each browser, as given by attribute_set_groups.
+
+    Returns:
+        The entropy of the fingerprints, each group being a fingerprint.
+    """
+    # The sizes are sorted so that the same distributions give exactly the
+    # same entropy
+    group_sizes = np.sort(np.bincount(groups))
+    return entropy(group_sizes, base=ENTROPY_BASE)
+
+
 class AttributeSetEntropy(Analysis):
     """Compute the entropy of the fingerprints considering an attribute set."""
 
@@ -3,11 +3,13 @@
 
 from typing import Any, List
 
+import numpy as np
 from loguru import logger
 
 from brfast.data.attribute import AttributeSet
 from brfast.data.dataset import FingerprintDataset
 from brfast.measures import Analysis
+from brfast.measures.distinguishability.entropy import attribute_set_groups
 
 COUNT_FIELD = '__count_field__'
 
@@ -36,14 +38,6 @@ class AttributeSetUnicity(Analysis):
         Raises:
             ValueError: The attribute set or the fingerprint dataset is empty.
             KeyError: An attribute is not in the fingerprint dataset.
-
-        Note:
-            For now, pandas does not include a dropna parameter in the
-            DataFrame.value_counts() function, hence it always drops the NaN
-            values that can be present in our fingerprint dataset. This results
-            in these fingerprints being ignored when counting the unique
-            fingerprints. In the future, if pandas include this parameter,
-            better use it instead of casting the values to strings.
         """
         # If an empty dataset of attribute set, we cannot compute the unicity
         if not self._attributes or self._dataset.dataframe.empty:
@@ -54,29 +48,17 @@ class AttributeSetUnicity(Analysis):
         # avoid overcounting effects
         df_one_fp_per_browser = self._dataset.get_df_w_one_fp_per_browser()
 
-        # Project the datafame on the wanted attributes
-        attribute_names = self._attributes.attribute_names
-        projected_dataframe = df_one_fp_per_browser[attribute_names]
-
-        # 1. Convert the values of the attributes as strings for the
-        #    fingerprints containing NaN values to not be ignored
-        # 2. Count the occurences of each distinct fingerprint
-        # 3. Name the count column as COUNT_FIELD
-        # 4. Project on the count column to obtain a Serie such that each value
-        #    is the number of browsers sharing a given fingerprint
-        fingerprint_occurences = (projected_dataframe
-                                  .astype('str')
-                                  .value_counts(sort=False)
-                                  .reset_index(name=COUNT_FIELD)
-                                  [COUNT_FIELD])
+        # Group the browsers that share the same fingerprint, their values
+        # being encoded as integer codes, then count the browsers of each
+        # fingerprint
+        fingerprint_occurences = np.bincount(attribute_set_groups(
+            df_one_fp_per_browser, self._attributes))
 
         # Compute the number of unique fingerprints
-        unique_fingerprints = (fingerprint_occurences
-                               [fingerprint_occurences == 1]
-                               .sum())
+        unique_fingerprints = np.count_nonzero(fingerprint_occurences == 1)
 
         # Count the total number of browsers
-        total_browsers = len(projected_dataframe)
+        total_browsers = len(df_one_fp_per_browser)
 
         # Store the results
         self._result[UNIQUE_FPS_RESULT] = unique_fingerprints
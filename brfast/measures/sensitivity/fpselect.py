@@ -4,11 +4,13 @@
 import importlib
 from typing import List
 
+import numpy as np
 from loguru import logger
 
 from brfast.data.attribute import AttributeSet
 from brfast.data.dataset import FingerprintDataset
 from brfast.measures import SensitivityMeasure
+from brfast.measures.distinguishability.entropy import attribute_set_groups
 # from measures.similarity import TODO
 
 # Import the engine of the analysis module (pandas or modin)
@@ -180,13 +182,18 @@ class TopKFingerprints(SensitivityMeasure):
         Returns:
             The sensitivity of the attribute set.
         """
-        # Get the names of the attributes that we consider
-        attribute_names = [attribute.name for attribute in attribute_set]
-
-        # Get the k-most common/shared fingerprints
-        top_k_fingerprints = _get_top_k_fingerprints(
-            self._working_dataframe, attribute_names, self._k)
-        browsers_sharing_top_k_fps = top_k_fingerprints[PROPORTION_FIELD].sum()
+        # No browser shares a fingerprint in an empty dataset
+        if self._working_dataframe.empty:
+            return 0.0
+
+        # Group the browsers that share the same fingerprint, their values
+        # being encoded as integer codes, and get the proportion of the
+        # browsers sharing each of the k-most common/shared fingerprints
+        fingerprint_occurences = np.bincount(attribute_set_groups(
+            self._working_dataframe, attribute_set))
+        top_k_proportions = (np.sort(fingerprint_occurences)[::-1][:self._k]
+                             / len(self._working_dataframe))
+        browsers_sharing_top_k_fps = top_k_proportions.sum()
         logger.debug(f'The top {self._k} fingerprints are shared by '
                      f'{browsers_sharing_top_k_fps} of the browsers.')
 
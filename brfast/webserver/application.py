@@ -6,13 +6,14 @@ from csv import DictReader
 from datetime import datetime
 from http import HTTPStatus
 from json.decoder import JSONDecodeError
-from pathlib import PurePath
+from pathlib import Path, PurePath
 
 from flask import (abort, flash, Flask, json, jsonify, redirect, request,
                    render_template, send_file, url_for)
 from loguru import logger
 
-from brfast.config import params
+from brfast.config import (CFG, check_parameter, get_bootstrap_progress_bars,
+                           secret_key_size, upload_foler)
 from brfast.data.attribute import Attribute, AttributeSet
 from brfast.data.dataset import (FingerprintDatasetFromCSVInMemory,
                                  MissingMetadatasFields)
@@ -34,11 +35,17 @@ from brfast.webserver.form_validation import (
     erroneous_field, erroneous_post_file)
 
 
+# The upload folder where to save the temporary files, only checked when the
+# web server starts
+check_parameter(
+    Path(upload_foler).is_dir(),
+    f'The upload folder {upload_foler} of the web server does not exist',
+    lambda: f'Using the upload folder {upload_foler}')
+
 # The Flask application
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = params.get('WebServer', 'upload_folder')
-app.secret_key = secrets.token_bytes(
-    params.getint('WebServer', 'secret_key_size'))
+app.config['UPLOAD_FOLDER'] = upload_foler
+app.secret_key = secrets.token_bytes(secret_key_size)
 
 # Set the exploration methods, the sensitivity measures, and the usability cost
 # measures below
@@ -97,13 +104,13 @@ def trace_configuration():
             TRACE_DATA = json.load(request.files['trace-file'])
         except JSONDecodeError:
             error_message = 'The trace file is not correctly formated.'
-            flash(error_message, params.get('WebServer', 'flash_error_class'))
+            flash(error_message, CFG.flash_classes['error'])
             logger.error(error_message)
             return render_template('trace-configuration.html')
 
         # Check the content of the trace file
         if error_message := trace_file_errors(TRACE_DATA):
-            flash(error_message, params.get('WebServer', 'flash_error_class'))
+            flash(error_message, CFG.flash_classes['error'])
             logger.error(error_message)
             return render_template('trace-configuration.html')
 
@@ -128,8 +135,7 @@ def trace_configuration():
                 except MissingMetadatasFields as mmf_error:
                     error_message = ('Ignored the fingerprint dataset due to '
                                      'the error: ' + str(mmf_error))
-                    flash(error_message, params.get('WebServer',
-                                                    'flash_warning_class'))
+                    flash(error_message, CFG.flash_classes['warning'])
                     logger.warning(error_message)
         # -- End of the management of the optional fingerprint dataset file ---
 
@@ -156,7 +162,7 @@ def trace_replay():
     # Show the visualization page
     return render_template('visualization.html',
                            parameters=TRACE_DATA[TraceData.PARAMETERS],
-                           javascript_parameters=params)
+                           javascript_parameters=CFG)
 
 
 # =========================== Real Time Exploration ===========================
@@ -223,10 +229,8 @@ def real_time_exploration_configuration():
 
             # Check that it is a strictly positive integer comprised in the
             # expected range
-            minimum_explored_paths = params.getint(
-                'WebServer', 'fpselect_minimum_explored_paths')
-            maximum_explored_paths = params.getint(
-                'WebServer', 'fpselect_maximum_explored_paths')
+            minimum_explored_paths = CFG.fpselect_minimum_explored_paths
+            maximum_explored_paths = CFG.fpselect_maximum_explored_paths
             explored_paths_error_message = erroneous_field(
                 request, 'explored-paths',
                 lambda v: v.isdigit() and (0 < minimum_explored_paths <= int(v)
@@ -254,10 +258,10 @@ def real_time_exploration_configuration():
         # ------------- Handle the most common fingerprints (=k) --------------
         top_k_fps_sens_meas = sensitivity_measures[0]
         if sensitivity_measure == top_k_fps_sens_meas:
-            minimum_common_fps = params.getint(
-                'WebServer', 'top_k_fingerprints_sensitivity_measure_min_k')
-            maximum_common_fps = params.getint(
-                'WebServer', 'top_k_fingerprints_sensitivity_measure_max_k')
+            minimum_common_fps = (
+                CFG.top_k_fingerprints_sensitivity_measure_min_k)
+            maximum_common_fps = (
+                CFG.top_k_fingerprints_sensitivity_measure_max_k)
 
             # Check that it is a strictly positive integer and comprised in the
             # range
@@ -285,7 +289,7 @@ def real_time_exploration_configuration():
             candidate_attributes = FINGERPRINT_DATASET.candidate_attributes
         except MissingMetadatasFields as mmf_error:
             error_message = str(mmf_error)
-            flash(error_message, params.get('WebServer', 'flash_error_class'))
+            flash(error_message, CFG.flash_classes['error'])
             logger.error(error_message)
             errors['fingerprint-dataset'] = error_message
 
@@ -339,8 +343,7 @@ def real_time_exploration_configuration():
                         error_message = (
                             f'The {key_error.args[0]} field is missing from '
                             'the memory cost results file.')
-                        flash(error_message, params.get('WebServer',
-                                                        'flash_error_class'))
+                        flash(error_message, CFG.flash_classes['error'])
                         logger.error(error_message)
                         errors['memory-cost-results'] = error_message
                         break  # Exit the for loop
@@ -379,8 +382,7 @@ def real_time_exploration_configuration():
                         error_message = (
                             f'The {key_error.args[0]} field is missing from '
                             'the instability cost results file.')
-                        flash(error_message, params.get('WebServer',
-                                                        'flash_error_class'))
+                        flash(error_message, CFG.flash_classes['error'])
                         logger.error(error_message)
                         errors['instability-cost-results'] = error_message
                         break  # Exit the for loop
@@ -427,8 +429,7 @@ def real_time_exploration_configuration():
                             err_mess = (
                                 f'The {key_error.args[0]} field is missing '
                                 'from the collection time cost results file.')
-                            flash(err_mess, params.get(
-                                'WebServer', 'flash_error_class'))
+                            flash(err_mess, CFG.flash_classes['error'])
                             logger.error(err_mess)
                             errors['collection-time-cost-results'] = err_mess
                             break  # Exit the for loop
@@ -486,7 +487,7 @@ def real_time_exploration_configuration():
     # Show the real time exploration configuration page
     return render_template(
         'real-time-exploration-configuration.html',
-        params=params, errors=errors, exploration_methods=exploration_methods,
+        parameters=CFG, errors=errors, exploration_methods=exploration_methods,
         sensitivity_measures=sensitivity_measures,
         usability_cost_measures=usability_cost_measures)
 
@@ -506,7 +507,7 @@ def real_time_exploration():
     # Show the visualization page
     return render_template('visualization.html',
                            parameters=REAL_TIME_EXPLORATION.parameters,
-                           javascript_parameters=params)
+                           javascript_parameters=CFG)
 
 
 # =================== Getter of the Explored Attribute Sets ===================
@@ -675,13 +676,13 @@ def attribute_set_information(attribute_set_id: int):
         # Collect a sample of the resulting fingerprints
         attr_subset_sample = AttributeSetSample(
             FINGERPRINT_DATASET, attributes,
-            params.getint('WebServer', 'fingerprint_sample_size'))
+            CFG.fingerprint_sample_size)
         attr_subset_sample.execute()
         fingerprint_sample = attr_subset_sample.result
     else:
         flash('Please provide a fingerprint dataset to obtain more insight on '
               'the selected attributes',
-              params.get('WebServer', 'flash_info_class'))
+              CFG.flash_classes['info'])
 
     # Compute the textual representation of the state of this attribute set
     attribute_set_state = None
@@ -704,9 +705,7 @@ def attribute_set_information(attribute_set_id: int):
             REAL_TIME_EXPLORATION.get_explored_attribute_sets(0, 1)[0])
     elif TRACE_DATA:
         candidate_attributes_infos = TRACE_DATA['exploration'][0]
-    bootstrap_progess_bars = (params
-                              .get('WebServer', 'bootstrap_progess_bars')
-                              .splitlines())
+    bootstrap_progess_bars = get_bootstrap_progress_bars()
 
     # The total usability cost
     cost_percentage = (100 * attribute_set_infos['usability_cost']
@@ -738,7 +737,7 @@ def attribute_set_information(attribute_set_id: int):
                            attribute_set_state=attribute_set_state,
                            usability_cost_ratio=usability_cost_ratio,
                            fingerprint_sample=fingerprint_sample,
-                           javascript_parameters=params)
+                           javascript_parameters=CFG)
 
 
 @app.route('/attribute-set-entropy/<int:attribute_set_id>')
@@ -8,7 +8,7 @@ from loguru import logger
 from werkzeug.local import LocalProxy
 from werkzeug.utils import secure_filename
 
-from brfast.config import params
+from brfast.config import CFG
 
 
 ALLOWED_EXTENSIONS = {'csv', 'json'}
@@ -53,13 +53,13 @@ def erroneous_field(request: LocalProxy, field_name: str,
     # Check that the field is in the form
     if field_name not in request.form:
         miss_err_mess = f'The field {field_name} is missing from the request.'
-        flash(miss_err_mess, params.get('WebServer', 'flash_error_class'))
+        flash(miss_err_mess, CFG.flash_classes['error'])
         logger.error(miss_err_mess)
         return miss_err_mess
 
     # Do the verifications on this field
     if not verification(request.form[field_name]):
-        flash(error_message, params.get('WebServer', 'flash_error_class'))
+        flash(error_message, CFG.flash_classes['error'])
         logger.error(error_message)
         return error_message
 
@@ -88,7 +88,7 @@ def erroneous_post_file(request: LocalProxy, field_name: str,
     # Check that the file is in the received POST request
     if not (field_name in request.files and request.files[field_name]):
         error_message = f'The {clean_field_name} file is missing.'
-        flash(error_message, params.get('WebServer', 'flash_error_class'))
+        flash(error_message, CFG.flash_classes['error'])
         logger.error(error_message)
         return error_message
 
@@ -102,7 +102,7 @@ def erroneous_post_file(request: LocalProxy, field_name: str,
                          ' allowed.')
         if expected_extension:
             error_message += f' Expected the extension: {expected_extension}.'
-        flash(error_message, params.get('WebServer', 'flash_error_class'))
+        flash(error_message, CFG.flash_classes['error'])
         logger.error(error_message)
         return error_message
 
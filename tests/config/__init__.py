@@ -0,0 +1,2 @@
+#!/usr/bin/python3
+"""Init file of the tests.config module."""
@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+"""Test module of the brfast.config module."""
+
+import importlib.util
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import brfast.config
+from brfast.config import (_get_params_cache_path, _load_params,
+                           _parse_params, _write_params_cache, CFG,
+                           check_parameter, ConfigError,
+                           get_bootstrap_progress_bars, OPTION_FILE_NAME,
+                           params)
+
+BRFAST_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+# Load the parameters of a config file in a child process, failing if they are
+# not loaded from the cache, and print one of them
+CHILD_PROCESS_LOAD_PARAMS = """
+import sys
+from unittest import mock
+import brfast.config
+brfast.config.CACHE_DIRECTORY = sys.argv[1]
+with mock.patch.object(brfast.config, '_parse_params',
+                       side_effect=AssertionError('Cache miss')):
+    values = brfast.config._load_params.__wrapped__(sys.argv[2])
+print(values['free_cores'])
+"""
+
+
+class TestCheckParameter(unittest.TestCase):
+
+    def test_correct_parameter(self):
+        check_parameter(True, 'Incorrect parameter', lambda: 'Correct')
+
+    def test_correct_parameter_without_success_message(self):
+        check_parameter(True, 'Incorrect parameter')
+
+    def test_incorrect_parameter(self):
+        with self.assertRaisesRegex(ConfigError, 'Incorrect parameter'):
+            check_parameter(False, 'Incorrect parameter', lambda: 'Correct')
+
+    def test_config_error_is_runtime_error(self):
+        with self.assertRaises(RuntimeError):
+            check_parameter(False, 'Incorrect parameter')
+
+
+class TestGetBootstrapProgressBars(unittest.TestCase):
+
+    def test_one_class_per_line(self):
+        expected_classes = tuple(
+            params.get('WebServer', 'bootstrap_progess_bars').splitlines())
+        self.assertEqual(expected_classes, get_bootstrap_progress_bars())
+
+    def test_same_object_on_each_call(self):
+        self.assertIs(get_bootstrap_progress_bars(),
+                      get_bootstrap_progress_bars())
+
+
+class TestFrozenParameters(unittest.TestCase):
+
+    def test_checked_values(self):
+        self.assertEqual(
+            params.getint('VisualizationParameters', 'node_radius'),
+            CFG.node_radius)
+        self.assertEqual(params.get('WebServer', 'flash_error_class'),
+                         CFG.flash_classes['error'])
+        self.assertEqual(params.get('NodeColour', 'default'),
+                         CFG.node_colours['default'])
+
+    def test_cannot_be_modified(self):
+        with self.assertRaises(AttributeError):
+            CFG.node_radius = 0
+        with self.assertRaises(TypeError):
+            CFG.node_colours['default'] = 'black'
+
+
+class TestParamsCache(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary_directory = tempfile.mkdtemp()
+        self._option_file_path = os.path.join(self._temporary_directory,
+                                              OPTION_FILE_NAME)
+        shutil.copy2(os.path.join(BRFAST_ROOT, OPTION_FILE_NAME),
+                     self._option_file_path)
+        self._cache_directory = os.path.join(self._temporary_directory,
+                                             'cache')
+        cache_directory_patcher = mock.patch.object(
+            brfast.config, 'CACHE_DIRECTORY', self._cache_directory)
+        cache_directory_patcher.start()
+        self.addCleanup(cache_directory_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self._temporary_directory)
+
+    def _load_params(self):
+        with mock.patch.object(brfast.config, '_parse_params',
+                               wraps=brfast.config._parse_params) as parse:
+            values = _load_params.__wrapped__(self._option_file_path)
+        return values, parse.call_count
+
+    def test_cache_miss_then_hit(self):
+        values, parse_count = self._load_params()
+        self.assertEqual(1, parse_count)
+        self.assertTrue(os.path.isfile(
+            _get_params_cache_path(self._option_file_path)))
+        cached_values, parse_count = self._load_params()
+        self.assertEqual(0, parse_count)
+        self.assertEqual(values.keys(), cached_values.keys())
+        self.assertEqual(values['analysis_engine'],
+                         cached_values['analysis_engine'])
+
+    def test_cache_invalidated_on_config_change(self):
+        cache_path = _get_params_cache_path(self._option_file_path)
+        self._load_params()
+        with open(self._option_file_path, 'a') as option_file:
+            option_file.write('\n# A comment that changes the size\n')
+        self.assertNotEqual(cache_path,
+                            _get_params_cache_path(self._option_file_path))
+        _, parse_count = self._load_params()
+        self.assertEqual(1, parse_count)
+
+    def test_unchanged_config_in_child_process(self):
+        values, _ = self._load_params()
+        # A child process computes the same cache path, hence loads the
+        # cached values without parsing the config file
+        child_process = subprocess.run(
+            [sys.executable, '-c', CHILD_PROCESS_LOAD_PARAMS,
+             self._cache_directory, self._option_file_path],
+            cwd=BRFAST_ROOT, capture_output=True, text=True, check=False)
+        self.assertEqual(0, child_process.returncode, child_process.stderr)
+        self.assertEqual(str(values['free_cores']),
+                         child_process.stdout.strip())
+
+    def test_changed_config_after_reload(self):
+        values, _ = self._load_params()
+        with open(self._option_file_path) as option_file:
+            config_content = option_file.read()
+        free_cores = values['free_cores']
+        with open(self._option_file_path, 'w') as option_file:
+            option_file.write(config_content.replace(
+                f'free_cores = {free_cores}',
+                f'free_cores = {free_cores + 1}'))
+        # A reloaded process (e.g., the Flask reloader) does not load the
+        # stale values of the previous config file
+        reloaded_values, parse_count = self._load_params()
+        self.assertEqual(1, parse_count)
+        self.assertEqual(free_cores + 1, reloaded_values['free_cores'])
+
+    def test_copies_do_not_share_the_cache(self):
+        copy_directory = os.path.join(self._temporary_directory, 'copy')
+        os.mkdir(copy_directory)
+        copy_path = os.path.join(copy_directory, OPTION_FILE_NAME)
+        shutil.copy2(self._option_file_path, copy_path)
+        self.assertEqual(os.stat(self._option_file_path).st_mtime_ns,
+                         os.stat(copy_path).st_mtime_ns)
+        self.assertNotEqual(_get_params_cache_path(self._option_file_path),
+                            _get_params_cache_path(copy_path))
+
+    def _set_data_analysis_option(self, option, value):
+        with open(self._option_file_path) as option_file:
+            config_content = re.sub(rf'(?m)^\s*{option}\s*=.*$', '',
+                                    option_file.read())
+        with open(self._option_file_path, 'w') as option_file:
+            option_file.write(config_content.replace(
+                '[DataAnalysis]', f'[DataAnalysis]\n  {option} = {value}', 1))
+
+    def test_csv_engine_defaults_to_c(self):
+        self.assertEqual('c', self._load_params()[0]['csv_engine'])
+
+    def test_unknown_csv_engine(self):
+        self._set_data_analysis_option('csv_engine', 'unknown')
+        with self.assertRaises(ConfigError):
+            _parse_params(self._option_file_path)
+
+    @unittest.skipIf(importlib.util.find_spec('pyarrow') is not None,
+                     'pyarrow is installed')
+    def test_pyarrow_csv_engine_without_pyarrow(self):
+        self._set_data_analysis_option('csv_engine', 'pyarrow')
+        with self.assertRaises(ConfigError):
+            self._load_params()
+
+    @unittest.skipIf(importlib.util.find_spec('pyarrow') is not None,
+                     'pyarrow is installed')
+    def test_pyarrow_csv_engine_checked_on_cache_hit(self):
+        # The cached values were saved while pyarrow was installed
+        values, _ = self._load_params()
+        values['csv_engine'] = 'pyarrow'
+        _write_params_cache(values,
+                            _get_params_cache_path(self._option_file_path))
+        with self.assertRaises(ConfigError):
+            self._load_params()
+
+    def test_stale_caches_are_removed(self):
+        cache_path = _get_params_cache_path(self._option_file_path)
+        self._load_params()
+        with open(self._option_file_path, 'a') as option_file:
+            option_file.write('\n# A comment that changes the size\n')
+        self._load_params()
+        self.assertFalse(os.path.exists(cache_path))
+        self.assertEqual(
+            [os.path.basename(
+                _get_params_cache_path(self._option_file_path))],
+            os.listdir(self._cache_directory))
+
+    def test_caches_of_other_config_files_are_kept(self):
+        copy_directory = os.path.join(self._temporary_directory, 'copy')
+        os.mkdir(copy_directory)
+        copy_path = os.path.join(copy_directory, OPTION_FILE_NAME)
+        shutil.copy2(self._option_file_path, copy_path)
+        self._load_params()
+        _load_params.__wrapped__(copy_path)
+        self.assertTrue(os.path.isfile(
+            _get_params_cache_path(self._option_file_path)))
+        self.assertTrue(os.path.isfile(_get_params_cache_path(copy_path)))
+
+    def test_categorize_strings_defaults_to_false(self):
+        self.assertIs(False, self._load_params()[0]['categorize_strings'])
+
+    def test_invalid_categorize_strings(self):
+        self._set_data_analysis_option('categorize_strings', 'maybe')
+        with self.assertRaises(ConfigError):
+            _parse_params(self._option_file_path)
+
+    def test_missing_config_file(self):
+        with self.assertRaises(ConfigError):
+            _get_params_cache_path(os.path.join(self._temporary_directory,
+                                                'missing.ini'))
+
+
+if __name__ == '__main__':
+    unittest.main()
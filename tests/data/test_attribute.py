@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """Test module of the data module of BrFAST."""
 
+import gc
+import pickle
 import unittest
 
 from brfast.data.attribute import Attribute, AttributeSet, DuplicateAttributeId
@@ -18,6 +20,28 @@ class TestAttribute(unittest.TestCase):
         self.assertEqual(self._attribute.attribute_id, self._attribute_id)
         self.assertEqual(self._attribute.name, self._name)
 
+    def test_get_or_create(self):
+        attribute = Attribute.get_or_create(self._attribute_id, self._name)
+        self.assertEqual(self._attribute, attribute)
+        self.assertIs(attribute, Attribute.get_or_create(self._attribute_id,
+                                                         self._name))
+        other_name_attribute = Attribute.get_or_create(self._attribute_id,
+                                                       'screen_width')
+        self.assertIsNot(attribute, other_name_attribute)
+        self.assertEqual('screen_width', other_name_attribute.name)
+
+    def test_get_or_create_does_not_keep_unused_attributes(self):
+        registry_key = (self._attribute_id, 'unused_attribute')
+        attribute = Attribute.get_or_create(*registry_key)
+        self.assertIs(attribute, Attribute._registry[registry_key])
+        del attribute
+        gc.collect()
+        self.assertNotIn(registry_key, Attribute._registry)
+
+    def test_pickle(self):
+        attribute = Attribute.get_or_create(self._attribute_id, self._name)
+        self.assertEqual(attribute, pickle.loads(pickle.dumps(attribute)))
+
     def test_repr(self):
         self.assertIsInstance(f'{self._attribute}', str)
 
@@ -27,6 +51,10 @@ class TestAttribute(unittest.TestCase):
         with self.assertRaises(AttributeError):
             self._attribute.name = 'screen_width'
 
+    def test_no_other_attribute(self):
+        with self.assertRaises(AttributeError):
+            self._attribute.other_field = 'value'
+
     def test_equality_new_attribute_same_id_name(self):
         # Another attribute object with the same id / name
         new_attribute = Attribute(self._attribute_id, self._name)
@@ -49,6 +77,18 @@ class TestAttribute(unittest.TestCase):
         self.assertTrue(higher_id_attribute > self._attribute)
         self.assertFalse(higher_id_attribute < self._attribute)
 
+    def test_inequality_or_equality(self):
+        lower_id_attribute = Attribute(1, 'lower_id_attribute')
+        same_id_attribute = Attribute(self._attribute_id, self._name)
+        self.assertTrue(self._attribute >= lower_id_attribute)
+        self.assertFalse(self._attribute <= lower_id_attribute)
+        self.assertTrue(self._attribute >= same_id_attribute)
+        self.assertTrue(self._attribute <= same_id_attribute)
+        self.assertEqual([lower_id_attribute, self._attribute],
+                         sorted([self._attribute, lower_id_attribute]))
+        with self.assertRaises(TypeError):
+            self._attribute <= self._attribute_id
+
     def test_inequality_with_integers(self):
         lower_id, higher_id = 1, 42
         with self.assertRaises(TypeError):
@@ -85,6 +125,23 @@ class TestAttributeSet(unittest.TestCase):
             #      duplicated attributes having the same hash as it relies only
             #      on the id of the attribute.
 
+    def test_create_attribute_set_same_attribute_twice(self):
+        with self.assertRaises(DuplicateAttributeId):
+            AttributeSet([self._timezone, self._user_agent, self._timezone])
+
+    def test_create_attribute_set_from_attribute_set(self):
+        copied_attr_set = AttributeSet(self._attribute_set)
+        self.assertEqual(self._attribute_set, copied_attr_set)
+        self.assertEqual(self._attribute_set.attribute_ids,
+                         copied_attr_set.attribute_ids)
+        copied_attr_set.remove(self._timezone)
+        self.assertEqual(2, len(copied_attr_set))
+        self.assertEqual(3, len(self._attribute_set))
+        self.assertIn(self._timezone, self._attribute_set)
+        self.assertEqual(
+            self._timezone,
+            self._attribute_set.get_attribute_by_name(self._timezone.name))
+
     def test_repr(self):
         self.assertIsInstance(repr(self._empty_attr_set), str)
         self.assertIsInstance(repr(self._single_attribute_set), str)
@@ -148,6 +205,56 @@ class TestAttributeSet(unittest.TestCase):
         self.assertIn(self._user_agent, new_attr_set)
         self.assertIn(new_attribute, new_attr_set)
 
+    def test_sorted_ids_after_add_and_remove(self):
+        new_attr_set = AttributeSet([self._do_not_track, self._user_agent])
+        self.assertEqual([self._user_agent.attribute_id,
+                          self._do_not_track.attribute_id],
+                         new_attr_set.attribute_ids)
+        new_attr_set.add(self._timezone)
+        self.assertEqual([self._user_agent, self._timezone,
+                          self._do_not_track], list(new_attr_set))
+        new_attr_set.remove(self._user_agent)
+        self.assertEqual([self._timezone.name, self._do_not_track.name],
+                         new_attr_set.attribute_names)
+
+    def test_attribute_names_and_ids_after_add(self):
+        new_attr_set = AttributeSet([self._user_agent])
+        attribute_names = new_attr_set.attribute_names
+        attribute_ids = new_attr_set.attribute_ids
+        attribute_names.append(self._timezone.name)
+        attribute_ids.append(self._timezone.attribute_id)
+        self.assertEqual([self._user_agent.name],
+                         new_attr_set.attribute_names)
+        self.assertEqual([self._user_agent.attribute_id],
+                         new_attr_set.attribute_ids)
+        new_attr_set.add(self._timezone)
+        self.assertEqual([self._user_agent.name, self._timezone.name],
+                         new_attr_set.attribute_names)
+        self.assertEqual([self._user_agent.attribute_id,
+                          self._timezone.attribute_id],
+                         new_attr_set.attribute_ids)
+
+    def test_equality_and_hash(self):
+        same_attribute_set = AttributeSet([self._do_not_track,
+                                           self._timezone, self._user_agent])
+        self.assertEqual(self._attribute_set, same_attribute_set)
+        self.assertEqual(hash(self._attribute_set), hash(same_attribute_set))
+        self.assertNotEqual(self._attribute_set, self._single_attribute_set)
+        self.assertNotEqual(self._attribute_set,
+                            frozenset(self._attribute_set.attribute_ids))
+
+    def test_hash_after_add_and_remove(self):
+        new_attr_set = AttributeSet({self._timezone})
+        self.assertEqual(hash(self._single_attribute_set), hash(new_attr_set))
+        new_attr_set.add(self._user_agent)
+        self.assertNotEqual(self._single_attribute_set, new_attr_set)
+        self.assertEqual(hash(AttributeSet({self._timezone,
+                                            self._user_agent})),
+                         hash(new_attr_set))
+        new_attr_set.remove(self._user_agent)
+        self.assertEqual(self._single_attribute_set, new_attr_set)
+        self.assertEqual(hash(self._single_attribute_set), hash(new_attr_set))
+
     def test_add_new_attribute_already_present(self):
         new_attr_set = AttributeSet({self._user_agent, self._timezone})
         with self.assertRaises(DuplicateAttributeId):
@@ -231,6 +338,40 @@ class TestAttributeSet(unittest.TestCase):
         with self.assertRaises(KeyError):
             self._attribute_set.get_attribute_by_name('unknown')
 
+    def test_get_attribute_by_name_after_remove(self):
+        new_attr_set = AttributeSet({self._user_agent, self._timezone})
+        new_attr_set.remove(self._user_agent)
+        self.assertEqual(
+            self._timezone,
+            new_attr_set.get_attribute_by_name(self._timezone.name))
+        with self.assertRaises(KeyError):
+            new_attr_set.get_attribute_by_name(self._user_agent.name)
+
+    def test_get_attribute_by_name_shared_name(self):
+        other_user_agent = Attribute(10, self._user_agent.name)
+        for attributes in ([self._user_agent, other_user_agent],
+                           [other_user_agent, self._user_agent]):
+            new_attr_set = AttributeSet(attributes)
+            self.assertEqual(
+                self._user_agent,
+                new_attr_set.get_attribute_by_name(self._user_agent.name))
+        new_attr_set = AttributeSet([other_user_agent])
+        new_attr_set.add(self._user_agent)
+        self.assertEqual(
+            self._user_agent,
+            new_attr_set.get_attribute_by_name(self._user_agent.name))
+
+    def test_get_attribute_by_name_shared_name_after_remove(self):
+        other_user_agent = Attribute(10, self._user_agent.name)
+        new_attr_set = AttributeSet([self._user_agent, other_user_agent])
+        new_attr_set.remove(self._user_agent)
+        self.assertEqual(
+            other_user_agent,
+            new_attr_set.get_attribute_by_name(self._user_agent.name))
+        new_attr_set.remove(other_user_agent)
+        with self.assertRaises(KeyError):
+            new_attr_set.get_attribute_by_name(self._user_agent.name)
+
 
 if __name__ == '__main__':
     unittest.main()
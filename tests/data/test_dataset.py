@@ -2,13 +2,17 @@
 """Test module of the data module of BrFAST."""
 
 import importlib
+import importlib.util
+import pickle
 import unittest
 from os import path
 from pathlib import PurePath
 from typing import List
+from unittest import mock
 
 from pandas.testing import assert_frame_equal  # To test DataFrame objects
 
+import brfast.config
 from brfast.data.attribute import AttributeSet
 from brfast.data.dataset import (
     FingerprintDataset, FingerprintDatasetFromFile,
@@ -63,6 +67,20 @@ DATASET_DATA = {
 }
 
 
+class DummyFingerprintDatasetFewDistinctValues(DummyFingerprintDataset):
+    """Dummy fingerprint dataset with an attribute of few distinct strings."""
+
+    DATAS = {
+        MetadataField.BROWSER_ID: [1, 2, 3, 4, 5],
+        MetadataField.TIME_OF_COLLECT: pd.date_range(('2021-03-12'),
+                                                     periods=5, freq='H'),
+        ATTRIBUTES[0].name: ['Firefox', 'Chrome', 'Chrome', 'Chrome',
+                             'Firefox'],
+        ATTRIBUTES[1].name: ['a', 'b', 'c', 'd', 'e'],
+        ATTRIBUTES[2].name: [1, 1, 1, 1, 1]
+    }
+
+
 class TestFingerprintDataset(unittest.TestCase):
 
     def setUp(self):
@@ -194,6 +212,79 @@ class TestFingerprintDataset(unittest.TestCase):
                                       self._clean_dataset.DATAS,
                                       list(range(clean_dataset_len)), True)
 
+    def test_get_df_w_one_fp_per_browser_read_only(self):
+        dataset = self._dummy_fp_dataset
+        for last_fingerprint in (True, False):
+            df_w_1_fp_p_bswr = dataset.get_df_w_one_fp_per_browser(
+                last_fingerprint=last_fingerprint)
+            with self.assertRaises(ValueError):
+                df_w_1_fp_p_bswr.iloc[0, 0] = 'modified'
+
+    def test_get_df_w_one_fp_per_browser_single_fp_read_only(self):
+        dataset = self._clean_dataset
+        for last_fingerprint in (True, False):
+            df_w_1_fp_p_bswr = dataset.get_df_w_one_fp_per_browser(
+                last_fingerprint=last_fingerprint)
+            with self.assertRaises(ValueError):
+                df_w_1_fp_p_bswr.iloc[0, 0] = 'modified'
+
+    def test_dataframe_writable_after_one_fp_per_browser(self):
+        for dataset in (self._dummy_fp_dataset, self._clean_dataset):
+            dataset.get_df_w_one_fp_per_browser()
+            dataset.dataframe.iloc[0, 0] = 'modified'
+            self.assertEqual('modified', dataset.dataframe.iloc[0, 0])
+
+    def test_get_df_w_one_fp_per_browser_computes_both(self):
+        dataset = self._dummy_fp_dataset
+        last_fp_df = dataset.get_df_w_one_fp_per_browser(True)
+        first_fp_df = dataset.get_df_w_one_fp_per_browser(False)
+        self.assertIs(last_fp_df, dataset.get_df_w_one_fp_per_browser(True))
+        self.assertIs(first_fp_df,
+                      dataset.get_df_w_one_fp_per_browser(False))
+
+    def test_categorize_strings(self):
+        with mock.patch.object(brfast.config, 'categorize_strings', True):
+            dataset = DummyFingerprintDatasetFewDistinctValues()
+        dataframe = dataset.dataframe
+        self.assertEqual('category', dataframe[ATTRIBUTES[0].name].dtype)
+        self.assertEqual('object', dataframe[ATTRIBUTES[1].name].dtype)
+        self.assertEqual('int64', dataframe[ATTRIBUTES[2].name].dtype)
+        self.assertEqual(
+            DummyFingerprintDatasetFewDistinctValues.DATAS[ATTRIBUTES[0].name],
+            dataframe[ATTRIBUTES[0].name].tolist())
+
+    def test_one_fp_per_browser_read_only_categorical_columns(self):
+        with mock.patch.object(brfast.config, 'categorize_strings', True):
+            dataset = DummyFingerprintDatasetFewDistinctValues()
+        categorical_column = dataset.dataframe.columns.get_loc(
+            ATTRIBUTES[0].name)
+        expected_values = dataset.dataframe[ATTRIBUTES[0].name].tolist()
+        for last_fingerprint in (True, False):
+            df_w_1_fp_p_bswr = dataset.get_df_w_one_fp_per_browser(
+                last_fingerprint=last_fingerprint)
+            self.assertEqual(
+                'category', df_w_1_fp_p_bswr[ATTRIBUTES[0].name].dtype)
+            with self.assertRaises(ValueError):
+                df_w_1_fp_p_bswr.iloc[0, categorical_column] = 'Chrome'
+        self.assertEqual(expected_values,
+                         dataset.dataframe[ATTRIBUTES[0].name].tolist())
+
+        # The dataset itself stays writable
+        dataset.dataframe.iloc[0, categorical_column] = 'Chrome'
+        self.assertEqual('Chrome',
+                         dataset.dataframe.iloc[0, categorical_column])
+
+    def test_pickle_with_cached_dataframe(self):
+        last_fp_df = self._dummy_fp_dataset.get_df_w_one_fp_per_browser()
+        unpickled_dataset = pickle.loads(pickle.dumps(self._dummy_fp_dataset))
+        assert_frame_equal(last_fp_df,
+                           unpickled_dataset.get_df_w_one_fp_per_browser(),
+                           check_frame_type=False)  # As modin can be used
+        assert_frame_equal(
+            self._dummy_fp_dataset.get_df_w_one_fp_per_browser(False),
+            unpickled_dataset.get_df_w_one_fp_per_browser(False),
+            check_frame_type=False)  # As modin can be used
+
 
 class TestFingerprintDatasetFromFile(TestFingerprintDataset):
 
@@ -328,6 +419,29 @@ class TestFingerprintDatasetFromCSVFile(TestFingerprintDatasetFromFile):
                                       DATASET_DATA['clean'],
                                       list(range(clean_dataset_len)), True)
 
+    def test_csv_engine_is_the_checked_parameter(self):
+        raw_csv_engine = params.get('DataAnalysis', 'csv_engine',
+                                    fallback=None)
+        params.set('DataAnalysis', 'csv_engine', 'unknown')
+        try:
+            dataset = FingerprintDatasetFromCSVFile(self._sample_path)
+        finally:
+            if raw_csv_engine is None:
+                params.remove_option('DataAnalysis', 'csv_engine')
+            else:
+                params.set('DataAnalysis', 'csv_engine', raw_csv_engine)
+        assert_frame_equal(self._dummy_fp_dataset.dataframe,
+                           dataset.dataframe)
+
+    @unittest.skipIf(importlib.util.find_spec('pyarrow') is None,
+                     'pyarrow is not installed')
+    def test_pyarrow_csv_engine(self):
+        with mock.patch.object(brfast.config, 'csv_engine', 'pyarrow'):
+            pyarrow_dataset = FingerprintDatasetFromCSVFile(self._sample_path)
+        self.check_dataframe_property(pyarrow_dataset, DATASET_DATA['sample'])
+        assert_frame_equal(self._dummy_fp_dataset.dataframe,
+                           pyarrow_dataset.dataframe)
+
 
 class TestFingerprintDatasetFromCSVInMemory(TestFingerprintDataset):
 
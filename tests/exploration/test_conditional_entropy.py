@@ -18,6 +18,8 @@ from brfast.exploration.conditional_entropy import (
     _get_best_conditional_entropic_attribute,
     _best_conditional_entropic_attribute, ConditionalEntropy)
 from brfast.measures import UsabilityCostMeasure, SensitivityMeasure
+from brfast.measures.distinguishability.entropy import (
+    attribute_set_groups, attribute_value_codes, groups_entropy)
 
 from tests.data import (ATTRIBUTES, DummyCleanDataset, DummyEmptyDataset,
                         UNEXISTENT_ATTRIBUTE)
@@ -120,6 +122,24 @@ class TestBestConditionalEntropic(unittest.TestCase):
             candidate_attributes=self._attribute_set)
         self.assertEqual(best_cond_ent_attr[0], ATTRIBUTES[1])
 
+    def test_best_conditional_entropic_attribute_candidate_entropies(self):
+        value_codes = attribute_value_codes(self._df_w_one_fp_per_browser,
+                                            self._attribute_set)
+        candidate_entropies = [groups_entropy(value_codes[:, position])
+                               for position in range(len(ATTRIBUTES))]
+        for current_attributes in (AttributeSet(), AttributeSet({
+                ATTRIBUTES[1]}), AttributeSet({ATTRIBUTES[0]})):
+            current_groups = attribute_set_groups(
+                self._df_w_one_fp_per_browser, current_attributes)
+            expected_result = _best_conditional_entropic_attribute(
+                self._df_w_one_fp_per_browser, current_attributes,
+                self._attribute_set, current_groups, value_codes)
+            result = _best_conditional_entropic_attribute(
+                self._df_w_one_fp_per_browser, current_attributes,
+                self._attribute_set, current_groups, value_codes,
+                candidate_entropies)
+            self.assertEqual(result, expected_result)
+
     def test_best_conditional_entropic_attribute_all_taken(self):
         best_cond_ent_attr = _best_conditional_entropic_attribute(
             self._df_w_one_fp_per_browser,
@@ -4,17 +4,20 @@
 import importlib
 import json
 import unittest
+from datetime import timedelta
+from time import perf_counter
 from typing import Any, Dict, List, Optional, Set
 from pathlib import PurePath
 from os import path, remove
+from queue import Queue
 
 from sortedcontainers import SortedDict
 
 from brfast.config import ANALYSIS_ENGINES, params
-from brfast.data.attribute import AttributeSet
+from brfast.data.attribute import Attribute, AttributeSet
 from brfast.exploration import (
     Exploration, ExplorationNotRun, ExplorationParameters,
-    SensitivityThresholdUnreachable, State, TraceData)
+    SensitivityThresholdUnreachable, State, TraceData, get_elapsed_time)
 
 from tests.data import ATTRIBUTES, DummyCleanDataset
 from tests.exploration import (
@@ -199,6 +202,93 @@ class TestExploration(unittest.TestCase):
         self.check_run(expected_solution, expected_satisfying_attribute_sets,
                        expected_explored_attribute_sets)
 
+    def test_run_keeps_storages_local(self):
+        self._exploration.run()
+        self.assertIsInstance(self._exploration._solution, list)
+        self.assertIsInstance(self._exploration._explored_attr_sets, list)
+        self.assertIsInstance(
+            self._exploration._satisfying_attribute_sets, list)
+
+    def test_get_explored_attribute_sets_gives_copies(self):
+        self._exploration.run()
+        explored_attribute_sets = (
+            self._exploration.get_explored_attribute_sets())
+        for explored_attribute_set in explored_attribute_sets:
+            explored_attribute_set['id'] = 0
+        for explored_attribute_set in (
+                self._exploration.get_explored_attribute_sets()):
+            self.assertNotIn('id', explored_attribute_set)
+
+    def test_stored_attribute_sets_are_copies(self):
+        attribute_set = AttributeSet({ATTRIBUTES[0]})
+        self._exploration._update_solution(attribute_set)
+        self._exploration._add_satisfying_attribute_set(attribute_set)
+        attribute_set.add(ATTRIBUTES[1])
+        self.assertEqual(AttributeSet({ATTRIBUTES[0]}),
+                         self._exploration._solution[0])
+        self.assertEqual([AttributeSet({ATTRIBUTES[0]})],
+                         self._exploration._satisfying_attribute_sets)
+
+    def test_get_satisfying_attribute_sets_gives_copies(self):
+        self._exploration.run()
+        solution = self._exploration.get_solution()
+        for satisfying_attribute_set in (
+                self._exploration.get_satisfying_attribute_sets()):
+            satisfying_attribute_set.add(Attribute(0, 'other_attribute'))
+        self.assertEqual(solution, self._exploration.get_solution())
+        self.assertIn(solution,
+                      self._exploration.get_satisfying_attribute_sets())
+
+    def test_run_asynchronous_receives_all_the_updates(self):
+        process = self._exploration.run_asynchronous()
+        process.join()
+        self.assertTrue(self._exploration.get_explored_attribute_sets())
+        self.assertFalse(self._exploration._updates_receiver.is_alive())
+
+    def test_updates_are_sent_by_batches(self):
+        updates_queue = Queue()
+        self._exploration._updates_queue = updates_queue
+        self._exploration._last_updates_sending = perf_counter()
+        explored_attribute_sets = DummyExploration.EXPLORED_ATTRIBUTE_SETS
+        for explored_attribute_set in explored_attribute_sets:
+            self._exploration._add_explored_attribute_set(
+                explored_attribute_set)
+        self.assertTrue(updates_queue.empty())
+
+        # The pending updates are sent as a single batch
+        self._exploration._send_pending_updates()
+        self.assertEqual(
+            updates_queue.get_nowait(),
+            [('_add_explored_attribute_set', explored_attribute_set)
+             for explored_attribute_set in explored_attribute_sets])
+        self.assertTrue(updates_queue.empty())
+
+    def test_updates_are_sent_before_the_search(self):
+        updates_queue = Queue()
+        self._exploration._updates_queue = updates_queue
+        self._exploration._start_counter = perf_counter()
+        self._exploration._last_updates_sending = perf_counter()
+        pending_updates_at_search = []
+        self._exploration._search_for_solution = (
+            lambda: pending_updates_at_search.append(
+                list(self._exploration._pending_updates)))
+        self._exploration._run_in_process()
+        self.assertEqual([[]], pending_updates_at_search)
+
+    def test_evaluations_are_memoized(self):
+        attribute_set = AttributeSet({ATTRIBUTES[0], ATTRIBUTES[1]})
+        sensitivity = self._exploration._evaluate_sensitivity(attribute_set)
+        usability_cost = self._exploration._evaluate_usability_cost(
+            attribute_set)
+
+        # The measures are not evaluated again for the same attribute set
+        self._exploration._sensitivity = None
+        self._exploration._usability_cost = None
+        self.assertEqual(self._exploration._evaluate_sensitivity(
+            AttributeSet(attribute_set)), sensitivity)
+        self.assertEqual(self._exploration._evaluate_usability_cost(
+            AttributeSet(attribute_set)), usability_cost)
+
     def _check_save_trace(self, check_exploration=True):
         # Save the exploration trace
         self._exploration.save_exploration_trace(self._trace_path)
@@ -319,5 +409,20 @@ class TestExplorationMultiprocessing(TestExploration):
         params.set('Multiprocessing', 'explorations', 'true')
 
 
+class TestGetElapsedTime(unittest.TestCase):
+
+    def test_get_elapsed_time(self):
+        start_counter = perf_counter()
+        elapsed_time = get_elapsed_time(start_counter)
+        self.assertIsInstance(elapsed_time, timedelta)
+        self.assertGreaterEqual(elapsed_time, timedelta(0))
+        self.assertLessEqual(elapsed_time,
+                             timedelta(seconds=perf_counter() - start_counter))
+
+    def test_get_elapsed_time_in_the_past(self):
+        elapsed_time = get_elapsed_time(perf_counter() - 3.0)
+        self.assertGreaterEqual(elapsed_time, timedelta(seconds=3))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -18,7 +18,9 @@ from brfast.data.attribute import AttributeSet
 from brfast.exploration import (
     Exploration, ExplorationNotRun, ExplorationParameters,
     SensitivityThresholdUnreachable, State, TraceData)
-from brfast.exploration.fpselect import FPSelect, FPSelectParameters
+from brfast.exploration.fpselect import (
+    FPSelect, FPSelectParameters, _expand_attribute_sets, _get_attribute_bits,
+    _get_attribute_set_mask)
 from brfast.measures import UsabilityCostMeasure, SensitivityMeasure
 
 from tests.data import ATTRIBUTES, DummyCleanDataset
@@ -317,5 +319,43 @@ class TestFPSelectMultipathPruningOffMultiprocessing(TestFPSelectSinglePathPruni
 # ========== FPSelect using multiprocessing and the DummyCleanDataset =========
 
 
+class TestAttributeSetMasks(unittest.TestCase):
+
+    def setUp(self):
+        self._candidate_attributes = AttributeSet(ATTRIBUTES)
+        self._attribute_bits = _get_attribute_bits(self._candidate_attributes)
+
+    def test_get_attribute_bits(self):
+        self.assertEqual({ATTRIBUTES[0].attribute_id: 0b001,
+                          ATTRIBUTES[1].attribute_id: 0b010,
+                          ATTRIBUTES[2].attribute_id: 0b100},
+                         self._attribute_bits)
+
+    def test_get_attribute_set_mask(self):
+        self.assertEqual(0, _get_attribute_set_mask(AttributeSet(),
+                                                    self._attribute_bits))
+        self.assertEqual(0b101, _get_attribute_set_mask(
+            AttributeSet({ATTRIBUTES[0], ATTRIBUTES[2]}),
+            self._attribute_bits))
+
+    def test_expand_attribute_sets(self):
+        attribute_sets_to_expand = [AttributeSet({ATTRIBUTES[0]}),
+                                    AttributeSet({ATTRIBUTES[1]})]
+        satisfying_attribute_sets = {AttributeSet({ATTRIBUTES[1],
+                                                   ATTRIBUTES[2]})}
+        ignored_supersets = {AttributeSet({ATTRIBUTES[0], ATTRIBUTES[2]})}
+        self.assertEqual(
+            {AttributeSet({ATTRIBUTES[0], ATTRIBUTES[1]}),
+             AttributeSet({ATTRIBUTES[0], ATTRIBUTES[2]})},
+            _expand_attribute_sets(
+                attribute_sets_to_expand, self._candidate_attributes,
+                satisfying_attribute_sets, ignored_supersets, False))
+        self.assertEqual(
+            {AttributeSet({ATTRIBUTES[0], ATTRIBUTES[1]})},
+            _expand_attribute_sets(
+                attribute_sets_to_expand, self._candidate_attributes,
+                satisfying_attribute_sets, ignored_supersets, True))
+
+
 if __name__ == '__main__':
     unittest.main()
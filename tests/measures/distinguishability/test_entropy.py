@@ -7,7 +7,8 @@ from os import remove
 
 from brfast.data.attribute import Attribute, AttributeSet
 from brfast.measures.distinguishability.entropy import (
-    attribute_set_entropy, AttributeSetEntropy, ENTROPY_RESULT,
+    attribute_set_entropy, attribute_set_groups, attribute_value_codes,
+    groups_entropy, refine_groups, AttributeSetEntropy, ENTROPY_RESULT,
     MAXIMUM_ENTROPY_RESULT, NORMALIZED_ENTROPY_RESULT)
 
 from tests.data import (ATTRIBUTES, DummyCleanDataset, DummyEmptyDataset,
@@ -71,6 +72,84 @@ class TestAttributeSetEntropyFunction(unittest.TestCase):
         self.check_entropy_result(expected_entropy)
 
 
+class TestAttributeSetGroups(unittest.TestCase):
+
+    def setUp(self):
+        self._dataset = DummyCleanDataset()
+        self._df_one_fp_per_browser = (
+            self._dataset.get_df_w_one_fp_per_browser())
+
+    def test_no_attribute(self):
+        groups = attribute_set_groups(self._df_one_fp_per_browser, [])
+        self.assertEqual(groups.tolist(),
+                         [0] * len(self._df_one_fp_per_browser))
+        self.assertEqual(groups_entropy(groups), 0.0)
+
+    def test_same_entropy_as_attribute_set_entropy(self):
+        for attributes in ([ATTRIBUTES[0]], [ATTRIBUTES[1]], [ATTRIBUTES[2]],
+                           ATTRIBUTES[:2], ATTRIBUTES):
+            attribute_set = AttributeSet(attributes)
+            groups = attribute_set_groups(self._df_one_fp_per_browser,
+                                          attribute_set)
+            self.assertAlmostEqual(
+                groups_entropy(groups),
+                attribute_set_entropy(self._df_one_fp_per_browser,
+                                      attribute_set))
+
+    def test_refine_parent_groups(self):
+        parent_groups = attribute_set_groups(self._df_one_fp_per_browser,
+                                             [ATTRIBUTES[0]])
+        refined_groups = attribute_set_groups(
+            self._df_one_fp_per_browser, [ATTRIBUTES[1]], parent_groups)
+        expected_groups = attribute_set_groups(self._df_one_fp_per_browser,
+                                               ATTRIBUTES[:2])
+        self.assertEqual(refined_groups.tolist(), expected_groups.tolist())
+
+    def test_attribute_value_codes(self):
+        value_codes = attribute_value_codes(self._df_one_fp_per_browser,
+                                            ATTRIBUTES)
+        self.assertEqual(value_codes.shape,
+                         (len(self._df_one_fp_per_browser), len(ATTRIBUTES)))
+        for position, attribute in enumerate(ATTRIBUTES):
+            self.assertEqual(
+                len(set(value_codes[:, position])),
+                self._df_one_fp_per_browser[attribute.name].nunique())
+
+    def test_attribute_value_codes_categorical_columns(self):
+        dataframe = self._df_one_fp_per_browser.copy()
+        dataframe.iloc[0, 0] = None
+        categorical_dataframe = dataframe.astype('category')
+        for attributes in ([ATTRIBUTES[0]], ATTRIBUTES[:2], ATTRIBUTES):
+            groups = attribute_set_groups(dataframe, attributes)
+            categorical_groups = attribute_set_groups(categorical_dataframe,
+                                                      attributes)
+            self.assertEqual(groups.tolist(), categorical_groups.tolist())
+        value_codes = attribute_value_codes(categorical_dataframe,
+                                            [ATTRIBUTES[0]])
+        self.assertTrue((value_codes >= 0).all())
+
+    def test_refine_groups(self):
+        value_codes = attribute_value_codes(self._df_one_fp_per_browser,
+                                            ATTRIBUTES)
+        groups = attribute_set_groups(self._df_one_fp_per_browser,
+                                      [ATTRIBUTES[0]])
+        refined_groups = refine_groups(groups, value_codes[:, 1])
+        expected_groups = attribute_set_groups(self._df_one_fp_per_browser,
+                                               ATTRIBUTES[:2])
+        self.assertEqual(refined_groups.tolist(), expected_groups.tolist())
+
+    def test_empty_dataset(self):
+        self._dataset = DummyEmptyDataset()
+        with self.assertRaises(ValueError):
+            attribute_set_groups(self._dataset.get_df_w_one_fp_per_browser(),
+                                 ATTRIBUTES)
+
+    def test_unexistent_attribute(self):
+        with self.assertRaises(KeyError):
+            attribute_set_groups(self._df_one_fp_per_browser,
+                                 [UNEXISTENT_ATTRIBUTE])
+
+
 class TestAttributeSetEntropy(unittest.TestCase):
 
     def setUp(self):